@@ -18,17 +18,55 @@ please consult our Course Syllabus.
 This file is Copyright (c) 2025 CSC111 Teaching Team
 """
 from __future__ import annotations
-import json
-from typing import Optional
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
 
-from game_entities import Location, Item, NPC, Player
+from game_entities import (Location, Item, ItemCatalog, NPCRegistry, Player, PlacementOverlay,
+                           VisitedSet)
 from proj1_event_logger import Event, EventList
+from proj1_output import OutputSink, BufferedStdoutSink
+from proj1_pathfinding import PathFinder
+from proj1_undo import UndoHistory
+from proj1_world_loader import World, load_world
 
 
 # Note: You may add in other import statements here as needed
 
 # Note: You may add helper functions, classes, etc. below as needed
 
+# Debug output goes through these per-subsystem loggers, never to stdout with the player-facing text.
+# Enable a subsystem with e.g. logging.getLogger("adventure.movement").setLevel(logging.DEBUG);
+# while its level is disabled, its messages are never formatted or written.
+_world_log = logging.getLogger("adventure.world")
+_movement_log = logging.getLogger("adventure.movement")
+
+
+def normalize_input(text: str) -> str:
+    """Return the given line typed by a player in the form the game's commands are written in."""
+    return text.lower().strip()
+
+
+@dataclass(frozen=True)
+class Command:
+    """A player command, parsed once against the game's table of registered verbs.
+
+    Instance Attributes:
+        - verb: The registered verb this command matched, e.g. "go", "pick up" or "look".
+        - argument: The text following the verb, or "" if the verb takes no argument.
+        - text: The full command as entered (without surrounding whitespace).
+
+    Representation Invariants:
+        - self.text.startswith(self.verb)
+    """
+    verb: str
+    argument: str
+    text: str
+
+
+CommandHandler = Callable[[Command, EventList], None]
+
 
 class AdventureGame:
     """A text adventure game class storing all location, item and map data.
@@ -36,12 +74,18 @@ class AdventureGame:
     Instance Attributes:
         - current_location_id: the id of the current location the player is in.
         - ongoing: whether the game is ongoing.
-        - inventory: a list of items currently held by the player.
+        - inventory: the items currently held by the player.
         - score: the player's current score.
         - moves_made: the total number of moves made by the player.
         - moves_limit: the maximum number of moves allowed before the game ends.
-        - npcs: a list of non-player characters in the game.
+        - npcs: the non-player characters in the game, indexed by name and location.
         - player: an instance of the Player class representing the player.
+        - load_timings: the number of seconds each phase of loading the game data took.
+        - output: the sink all player-facing text is written to; it is flushed once per command.
+        - game_data_file: the name of the game data file the world was loaded from.
+        - source_hash: the hex SHA-256 digest of the game data the world was loaded from, or None if
+          the world loader did not record it.
+        - history: the recent commands' changes to the game state, which undo reverts.
 
     Representation Invariants:
         - current_location_id in self._locations
@@ -54,22 +98,44 @@ class AdventureGame:
     # Private Instance Attributes (do NOT remove these two attributes):
     #   - _locations: a mapping from location id to Location object.
     #                       This represents all the locations in the game.
-    #   - _items: a list of Item objects, representing all items in the game.
-
-    _locations: dict[int, Location]
-    _items: list[Item]
+    #   - _items: the Item objects representing all items in the game, indexed by name.
+    #   - _placements: an index of which location each item not held by the player is currently at,
+    #     kept as its differences from the world's placements.
+    #   - _visited: the ids of the locations the player has visited.
+    #   - _routes: the shortest routes between locations, shared with every game on the same world.
+    #   - _puzzle_locations: the ids of the locations with a puzzle.
+    #   - _commands: a mapping from each registered verb to its handler and whether the verb takes an argument.
+
+    _locations: Mapping[int, Location]
+    _items: ItemCatalog
+    _placements: PlacementOverlay
+    _visited: VisitedSet
+    _routes: PathFinder
+    _puzzle_locations: list[int]
+    _commands: dict[str, tuple[CommandHandler, bool]]
     player: Player
-    npcs: list[NPC]
+    npcs: NPCRegistry
     moves_made: int
     move_limit: int
     ongoing: bool
-
-    def __init__(self, game_data_file: str, initial_location_id: int) -> None:
+    load_timings: dict[str, float]
+    output: OutputSink
+    game_data_file: str
+    source_hash: Optional[str]
+    history: UndoHistory
+
+    def __init__(self, game_data_file: str, initial_location_id: int, game_log: Optional[EventList] = None,
+                 world_loader: Callable[[str], World] = load_world, output: Optional[OutputSink] = None) -> None:
         """
         Initialize a new text adventure game, based on the data in the given file, setting starting location of game
         at the given initial location ID.
         (note: you are allowed to modify the format of the file as you see fit)
 
+        The world is built by calling world_loader on game_data_file; pass
+        proj1_world_cache.load_cached_world to load a compiled world instead of parsing the JSON,
+        or functools.partial(load_world, lazy=True) to only build the locations the player visits.
+        Game text is written to output (by default, a BufferedStdoutSink).
+
         Preconditions:
         - game_data_file is the filename of a valid game data JSON file
         """
@@ -81,243 +147,266 @@ class AdventureGame:
         # 1. Make sure the Location class is used to represent each location.
         # 2. Make sure the Item class is used to represent each item.
 
-        # Suggested helper method (you can remove and load these differently if you wish to do so):
+        # The game data file is parsed once; locations, items and NPCs are all built from it
+        self.output = output if output is not None else BufferedStdoutSink()
         self.player = Player(initial_location_id, [], 500, 0)
-        self._locations, self._items = self._load_game_data(game_data_file)
-        self.npcs = self._load_npcs(game_data_file)
+        self.game_data_file = game_data_file
+        world = world_loader(game_data_file)
+        self.source_hash = world.source_hash
+        self._locations, self._items = world.locations, world.items
+        # Items are moved in an overlay even on an unspawned world, so undo snapshots stay small
+        self._placements = (world.placements if isinstance(world.placements, PlacementOverlay)
+                            else PlacementOverlay(world.placements))
+        self._visited = world.visited
+        self._routes = world.routes
+        self._puzzle_locations = world.puzzle_locations
+        self.npcs = world.npcs
+        self.load_timings = world.timings
         self.moves_made = 0
         self.move_limit = 20
         self.ongoing = True
-        self.game_log = game_log
+        self.game_log = game_log if game_log is not None else EventList()
+        self.history = UndoHistory(self.player, self._visited, self._placements)
+        self._commands = {}
+        self._register_default_commands()
 
         start_event = Event(self.player.current_location, "Game started", event_type="start")
         self.game_log.add_event(start_event)
 
-        print(f"DEBUG: Player initialized at location {self.player.current_location}")
+        _world_log.debug("Loaded %s with phase timings %s", game_data_file, self.load_timings)
+        _world_log.debug("Player initialized at location %s", self.player.current_location)
         self._move_player(self.player.current_location)
-
-    @staticmethod
-    def _load_game_data(filename: str) -> tuple[dict[int, Location], list[Item]]:
-        """Load locations and items from a JSON file."""
-        with open(filename, 'r') as f:
-            data = json.load(f)
-
-        locations = {
-            loc['id']: Location(
-                location_id=loc['id'],
-                brief_description=loc.get('brief_description', "No brief description available."),
-                long_description=loc.get('long_description', "No long description available."),
-                available_commands=loc.get('available_commands', {}),
-                items=loc.get('items', []),
-                rooms_contained=loc.get('rooms_contained', []),
-                condition_to_unlock=loc.get('condition_to_unlock', None),
-                steps_allowed=loc.get('steps_allowed', None),
-                npc=loc.get('npc', None),
-                puzzle=loc.get('puzzle', None)
-            ) for loc in data['locations']
-        }
-
-        items = [
-            Item(
-                name=item['name'],
-                start_position=item.get('start_position', -1),
-                target_position=item.get('target_position', None),
-                target_points=item.get('target_points', 0),
-                function=item.get('function', None),
-                items_contained=item.get('items_contained', []),
-                condition_to_unlock=item.get('condition_to_unlock', None),
-                coins=item.get('coins', 0)
-            ) for item in data['items']
-        ]
-
-        return locations, items
-
-    @staticmethod
-    def _load_npcs(filename: str) -> list[NPC]:
-        """Load NPCs from a JSON file."""
-        with open(filename, 'r') as f:
-            data = json.load(f)
-
-        npcs = []
-        for npc_data in data.get('npcs', []):
-            # Ensure selling_items is always a dictionary
-            selling_items = npc_data.get("selling_items", {})
-
-            npcs.append(NPC(
-                name=npc_data.get("name", ""),
-                dialogue=npc_data.get("dialogue", "No dialogue available."),
-                reward_points=npc_data.get("reward_points", 0),
-                location=npc_data.get("location"),
-                mission_items=npc_data.get("mission_items", []),
-                mission_complete_description=npc_data.get("mission_complete_description", ""),
-                selling_items=selling_items
-            ))
-
-        return npcs
+        self.output.flush()
 
     def get_items(self) -> list[Item]:
         """Return list of items associated with the game.
         """
-        return self._items
+        return self._items.items
+
+    def get_item(self, item_name: str) -> Optional[Item]:
+        """Return the item with the given name, or None if no such item exists."""
+        return self._items.get(item_name)
 
-    def get_location(self, loc_id: Optional[int] = None) -> Location | None:
-        """Return Location object associated with the provided location ID."""
+    def get_location(self, loc_id: Optional[int] = None, quiet: bool = False) -> Location | None:
+        """Return Location object associated with the provided location ID.
+        A missing location is logged as an error unless quiet is True.
+        """
         if loc_id is None:
             loc_id = self.player.current_location
 
         loc_obj = self._locations.get(loc_id, None)
 
         if loc_obj:
-            # Ensure items are updated correctly
-            loc_obj.items = [item.name for item in self._items if item.start_position == loc_id]
-
-            print(f"DEBUG: Location {loc_id} -> Visited? {loc_obj.visited}")
+            _world_log.debug("Location %s -> Visited? %s", loc_id, loc_id in self._visited)
             return loc_obj
         else:
-            print(f"ERROR: Location ID {loc_id} does not exist.")
+            if not quiet:
+                _world_log.error("Location ID %s does not exist.", loc_id)
             return None
 
-    def handle_special_command(self, user_input: str) -> None:
-        """Handle special command that is not in the menu."""
-
-        if user_input.startswith("go "):
-            self._handle_movement(user_input)
-
-        elif user_input.startswith("pick up "):
-            self._handle_item_pickup(user_input)
+    def get_item_location(self, item_name: str) -> Optional[int]:
+        """Return the id of the location the item with the given name lies at, or None if it is
+        not lying anywhere (e.g. because the player carries it)."""
+        return self._placements.location_of(item_name)
+
+    def items_at(self, location_id: Optional[int] = None) -> set[str]:
+        """Return the names of the items lying at the location with the given id (by default, the
+        player's current location)."""
+        return self._placements.items_at(self.player.current_location if location_id is None else location_id)
+
+    def place_item(self, item_name: str, location_id: Optional[int]) -> None:
+        """Put the item with the given name at the location with the given id, or take it out of
+        the world if location_id is None."""
+        if location_id is None:
+            self._placements.remove(item_name)
+        else:
+            self._placements.place(item_name, location_id)
+
+    def get_visited_locations(self) -> list[int]:
+        """Return the ids of the visited locations, in increasing order."""
+        return list(self._visited)
+
+    def set_visited_locations(self, location_ids: Iterable[int]) -> None:
+        """Mark exactly the locations with the given ids as visited."""
+        self._visited.restore(b'')
+        for location_id in location_ids:
+            self._visited.add(location_id)
+
+    def _register_default_commands(self) -> None:
+        """Register the verbs every game understands."""
+        self.register_command("look", lambda cmd, log: self._handle_look())
+        self.register_command("inventory", lambda cmd, log: self._handle_inventory())
+        self.register_command("score", lambda cmd, log: self._handle_score())
+        self.register_command("hint", lambda cmd, log: self._handle_hint())
+        self.register_command("undo", lambda cmd, log: self._handle_undo(log))
+        self.register_command("log", lambda cmd, log: log.display_events(self.output))
+        self.register_command("quit", lambda cmd, log: self._handle_quit())
+        self.register_command("talk", lambda cmd, log: self._handle_npc_interaction())
+        self.register_command("solve puzzle", lambda cmd, log: self._handle_puzzle_solving())
+        self.register_command("go", lambda cmd, log: self._handle_movement(cmd.text), takes_argument=True)
+        self.register_command("pick up", lambda cmd, log: self._handle_item_pickup(cmd.argument), takes_argument=True)
+        self.register_command("drop", lambda cmd, log: self._handle_item_drop(cmd.argument), takes_argument=True)
+        self.register_command("buy", lambda cmd, log: self._handle_item_purchase(cmd.argument), takes_argument=True)
+
+    def register_command(self, verb: str, handler: CommandHandler, takes_argument: bool = False) -> None:
+        """Register the given handler for the given verb, replacing any handler already registered for it.
 
-        elif user_input.startswith("drop "):
-            self._handle_item_drop(user_input)
+        Preconditions:
+        - verb != "" and len(verb.split()) <= 2
+        """
+        self._commands[verb] = (handler, takes_argument)
 
-        elif user_input == "talk":
-            self._handle_npc_interaction()
+    def parse_command(self, user_input: str) -> Optional[Command]:
+        """Return the Command for the given input, or None if it does not match a registered verb.
 
-        elif user_input == "solve puzzle":
-            self._handle_puzzle_solving()
+        A verb is at most two words long, so at most two table lookups are needed no matter
+        how many verbs are registered.
+        """
+        text = user_input.strip()
+        words = text.split(" ", 2)
+        for verb in (" ".join(words[:2]), words[0]):
+            entry = self._commands.get(verb)
+            if entry is not None:
+                argument = text[len(verb):].strip()
+                if bool(argument) != entry[1]:
+                    return None
+                return Command(verb, argument, text)
+        return None
+
+    def execute_command(self, command: Command, game_event_log: Optional[EventList] = None) -> None:
+        """Run the handler registered for the given parsed command, then flush its output.
+        The command's changes to the game state are recorded in the undo history.
+        """
+        handler, _ = self._commands[command.verb]
+        log = game_event_log if game_event_log is not None else self.game_log
+        self.history.begin(log, self.moves_made)
+        handler(command, log)
+        self.output.flush()
+
+    def handle_command(self, user_input: str, game_event_log: Optional[EventList] = None) -> None:
+        """Handle any player command, such as look, inventory, undo, go, pick up or buy.
+        Input that does not match a registered verb is ignored.
+        """
+        command = self.parse_command(user_input)
+        if command is not None:
+            self.execute_command(command, game_event_log)
 
-        elif user_input.startswith("buy "):
-            self._handle_item_purchase(user_input)
+    def handle_special_command(self, user_input: str, game_event_log: Optional[EventList] = None) -> None:
+        """Handle special command that is not in the menu.
+        All commands now share one dispatch table, so this is the same as handle_command.
+        """
+        self.handle_command(user_input, game_event_log)
 
     def _handle_movement(self, user_input: str) -> None:
         """Handle player movement between locations."""
         loc_obj = self.get_location()
 
-        print(f"DEBUG: Current Location: {self.player.current_location}")
-        print(f"DEBUG: Available Commands: {loc_obj.available_commands}")
+        if _movement_log.isEnabledFor(logging.DEBUG):
+            _movement_log.debug("Current location: %s", self.player.current_location)
+            _movement_log.debug("Available commands: %s", loc_obj.available_commands)
 
-        normalized_command = user_input.lower().strip()
-
-        # Find a matching command (case-insensitive)
-        matched_command = next((cmd for cmd in loc_obj.available_commands if cmd.lower() == normalized_command), None)
-
-        if matched_command:
-            new_location_id = loc_obj.available_commands[matched_command]
-
-            print(f"DEBUG: Moving to location {new_location_id}")
-
-            if isinstance(new_location_id, str) and new_location_id.isdigit():
-                new_location_id = int(new_location_id)
+        new_location_id = loc_obj.exits.get(user_input.casefold().strip())
 
+        if new_location_id is not None:
+            _movement_log.debug("Moving to location %s", new_location_id)
             self._move_player(new_location_id)
         else:
-            print("You cannot go there.")
+            self.output.write("You cannot go there.")
 
     def _move_player(self, new_location_id: int) -> None:
         """Move the player to a new location, showing a long description only on the first visit."""
         if isinstance(new_location_id, int) and new_location_id in self._locations:
             new_location = self._locations[new_location_id]  # Get existing location object
 
-            print(f"DEBUG: Moving player from {self.player.current_location} to {new_location_id}")
-            print(f"DEBUG: Before moving - Location {new_location_id} visited? {new_location.visited}")
+            _movement_log.debug("Moving player from %s to %s (visited before? %s)",
+                                self.player.current_location, new_location_id, new_location_id in self._visited)
 
             # Move player
             self.player.current_location = new_location_id
 
-            if not new_location.visited:
-                print(f"DEBUG: First time visiting {new_location_id}, showing long description.")
-                print(new_location.long_description)
-                new_location.visited = True
+            if new_location_id not in self._visited:
+                _movement_log.debug("First time visiting %s, showing long description.", new_location_id)
+                self.output.write(new_location.long_description)
+                self._visited.add(new_location_id)
+                self.history.record_visit(new_location_id)
             else:
-                print(f"DEBUG: Revisiting {new_location_id}, showing brief description.")
-                print(new_location.brief_description)
+                _movement_log.debug("Revisiting %s, showing brief description.", new_location_id)
+                self.output.write(new_location.brief_description)
 
-    def _handle_item_pickup(self, user_input: str) -> None:
-        """Handle picking up an item from the environment."""
-        item_name = user_input[8:].strip()
-        loc_obj = self.get_location()
-        if item_name in loc_obj.items:
-            item = next((i for i in self._items if i.name == item_name), None)
+    def _handle_item_pickup(self, item_name: str) -> None:
+        """Handle picking up the item with the given name from the environment."""
+        if self._placements.location_of(item_name) == self.player.current_location:
+            item = self._items.get(item_name)
             if item:
                 self.player.add_item(item)
-                loc_obj.items.remove(item_name)
-                print(f"You picked up {item_name}.")
+                self._placements.remove(item_name)
+                self.output.write(f"You picked up {item_name}.")
 
-    def _handle_item_drop(self, user_input: str) -> None:
-        """Handle dropping an item from the player's inventory."""
-        item_name = user_input[5:].strip()
+    def _handle_item_drop(self, item_name: str) -> None:
+        """Handle dropping the item with the given name from the player's inventory."""
         item = self.player.remove_item(item_name)
         if item:
-            self.get_location().items.append(item_name)
-            print(f"You dropped {item_name}.")
+            self._placements.place(item_name, self.player.current_location)
+            self.output.write(f"You dropped {item_name}.")
         else:
-            print(f"You are not carrying {item_name}.")
+            self.output.write(f"You are not carrying {item_name}.")
 
     def _handle_npc_interaction(self) -> None:
         """Handle interactions with an NPC at the player's current location."""
-        npc = next((n for n in self.npcs if n.location == self.player.current_location), None)
+        npc = self.npcs.first_at(self.player.current_location)
 
         if npc:
-            print(f"{npc.name}: {npc.dialogue}")
+            self.output.write(f"{npc.name}: {npc.dialogue}")
 
             # Check if NPC has a mission
-            if npc.mission_items and all(self.player.has_item(i) for i in npc.mission_items):
+            if npc.mission_items and self.player.has_all(npc.mission_items):
                 for item in npc.mission_items:
                     self.player.remove_item(item)
                 self.player.score += npc.reward_points
-                print(f"You completed {npc.name}'s task and earned {npc.reward_points} points!")
+                self.output.write(f"You completed {npc.name}'s task and earned {npc.reward_points} points!")
 
             elif npc.mission_items:
-                print(f"{npc.name} needs: {', '.join(npc.mission_items)}. You don't have all the required items yet.")
+                self.output.write(f"{npc.name} needs: {', '.join(npc.mission_items)}. "
+                                  f"You don't have all the required items yet.")
 
             # NPC shop interaction
             elif npc.selling_items:
-                print(f"{npc.name} has the following items for sale:")
+                self.output.write(f"{npc.name} has the following items for sale:")
                 for item, price in npc.selling_items.items():
-                    print(f" - {item}: {price} coins")
+                    self.output.write(f" - {item}: {price} coins")
         else:
-            print("There is no one to talk to here.")
+            self.output.write("There is no one to talk to here.")
 
     def _handle_puzzle_solving(self) -> None:
         """Handle solving a puzzle at the player's current location."""
         current_location = self.get_location()
 
         if current_location.puzzle:
-            print(f"You found a puzzle: {current_location.puzzle}")
+            self.output.write(f"You found a puzzle: {current_location.puzzle}")
 
             # Check if the puzzle requires an item
             required_item = current_location.condition_to_unlock
             if required_item and not self.player.has_item(required_item):
-                print(f"You need {required_item} to solve this puzzle.")
+                self.output.write(f"You need {required_item} to solve this puzzle.")
                 return
 
-            print(f"You solved the puzzle: {current_location.puzzle}!")
+            self.output.write(f"You solved the puzzle: {current_location.puzzle}!")
             self.player.score += 20  # Example: Reward points for solving a puzzle
 
             # Remove the required item if it was needed
             if required_item:
                 self.player.remove_item(required_item)
         else:
-            print("There is no puzzle to solve here.")
+            self.output.write("There is no puzzle to solve here.")
 
-    def _handle_item_purchase(self, user_input: str) -> None:
-        """Handle buying an item from an NPC shop."""
-        found_npc = next((n for n in self.npcs if n.location == self.player.current_location), None)
+    def _handle_item_purchase(self, item_name: str) -> None:
+        """Handle buying the item with the given name from an NPC shop."""
+        found_npc = next((n for n in self.npcs.at(self.player.current_location) if n.selling_items), None)
 
         if not found_npc or not found_npc.selling_items:
-            print("There is no NPC selling items here.")
+            self.output.write("There is no NPC selling items here.")
             return
 
-        item_name = user_input[4:].strip()
         item_price = found_npc.selling_items.get(item_name)
 
         if not self._can_purchase_item(item_name, item_price):
@@ -328,44 +417,24 @@ class AdventureGame:
     def _can_purchase_item(self, item_name: str, item_price: Optional[int]) -> bool:
         """Check if the player can purchase the given item."""
         if item_price is None:
-            print(f"'{item_name}' is not available for purchase.")
+            self.output.write(f"'{item_name}' is not available for purchase.")
             return False
         if self.player.coins < item_price:
-            print(f"You don't have enough coins to buy '{item_name}'.")
+            self.output.write(f"You don't have enough coins to buy '{item_name}'.")
             return False
         return True
 
     def _process_item_purchase(self, item_name: str, item_price: int) -> None:
         """Process the item purchase and update player inventory."""
         self.player.coins -= item_price
-        new_item = next((i for i in self._items if i.name.lower() == item_name.lower()), None)
+        new_item = self._items.find(item_name)
 
         if new_item:
             self.player.add_item(new_item)
-            print(f"You bought {item_name} for {item_price} coins.")
+            self._placements.remove(new_item.name)
+            self.output.write(f"You bought {item_name} for {item_price} coins.")
         else:
-            print("Something went wrong. Item not found in game data.")
-
-    def handle_command(self, user_input: str, game_event_log: EventList) -> None:
-        """Handle player commands such as look, inventory, score, undo, log, and quit."""
-
-        if user_input == "look":
-            self._handle_look()
-
-        elif user_input == "inventory":
-            self._handle_inventory()
-
-        elif user_input == "score":
-            self._handle_score()
-
-        elif user_input == "undo":
-            self._handle_undo(game_event_log)
-
-        elif user_input == "log":
-            game_event_log.display_events()
-
-        elif user_input == "quit":
-            self._handle_quit()
+            self.output.write("Something went wrong. Item not found in game data.")
 
     def _handle_look(self) -> None:
         """Handle the 'look' command.
@@ -374,53 +443,74 @@ class AdventureGame:
         """
         loc_obj = self.get_location()
         if loc_obj is not None:
-            if not loc_obj.visited:
+            if loc_obj.id_num not in self._visited:
                 # Show long description for the first visit
-                print(loc_obj.long_description)
-                loc_obj.visited = True  # Mark the location as visited
+                self.output.write(loc_obj.long_description)
+                self._visited.add(loc_obj.id_num)  # Mark the location as visited
+                self.history.record_visit(loc_obj.id_num)
             else:
                 # Show brief description for subsequent visits
-                print(loc_obj.brief_description)
+                self.output.write(loc_obj.brief_description)
 
     def _handle_inventory(self) -> None:
         """Display player's inventory and coins."""
         if self.player.inventory:
-            print("You are carrying:", ", ".join(item.name for item in self.player.inventory))
+            self.output.write("You are carrying: " + ", ".join(item.name for item in self.player.inventory))
         else:
-            print("Your inventory is empty.")
-        print(f"You have {self.player.coins} coins.")
+            self.output.write("Your inventory is empty.")
+        self.output.write(f"You have {self.player.coins} coins.")
 
     def _handle_score(self) -> None:
         """Display the player's score."""
-        print(f"Your current score is: {self.player.score}")
+        self.output.write(f"Your current score is: {self.player.score}")
+
+    def _handle_hint(self) -> None:
+        """Suggest the exit on a shortest route to the nearest other place with something to do."""
+        current = self.player.current_location
+        goals = self._hint_goals()
+        if current in goals:
+            self.output.write("Hint: there is something to do right here.")
+        nearest = self._routes.nearest(current, (loc_id for loc_id in goals if loc_id != current))
+        if nearest is None:
+            self.output.write("Hint: there is nowhere else to go that you can reach from here.")
+        else:
+            _, command, moves = nearest
+            self.output.write(f"Hint: try '{command}'. The next place with something to do is "
+                              f"{moves} move{'s' if moves > 1 else ''} away.")
+
+    def _hint_goals(self) -> list[int]:
+        """Return the ids of the locations with something to do: where NPCs are, where puzzles are, and
+        where the items the player carries are to be delivered."""
+        goals = [loc_id for loc_id in self.npcs.by_location if loc_id in self._locations]
+        goals.extend(self._puzzle_locations)
+        goals.extend(item.target_position for item in self.player.inventory
+                     if item.target_position in self._locations)
+        return goals
 
     def _handle_undo(self, game_event_log: EventList) -> None:
-        """Undo the last action if possible."""
-        if not game_event_log.is_empty():
-            last_event = game_event_log.last
-            if last_event and isinstance(last_event.prev_location, int):
-                self.player.current_location = last_event.prev_location
-                print(f"You've undone your last action. Back at location {self.player.current_location}.")
-                game_event_log.remove_last_event()
-            else:
-                print("No valid previous location to revert to.")
+        """Undo the last command that changed the game, restoring everything it changed and
+        removing the events it added to the given log."""
+        moves_made = self.history.undo(game_event_log)
+        if moves_made is not None:
+            self.moves_made = moves_made
+            self.output.write(f"You've undone your last action. Back at location {self.player.current_location}.")
         else:
-            print("Nothing to undo.")
+            self.output.write("Nothing to undo.")
 
     def _handle_quit(self) -> None:
         """Quit the game."""
-        print("You quit the game.")
+        self.output.write("You quit the game.")
         self.ongoing = False
 
     def check_win_condition(self) -> bool:
         """Check if the player has completed enough tasks to win the game."""
         completed_tasks = sum(
-            1 for npc in self.npcs if npc.mission_items and all(self.player.has_item(i) for i in npc.mission_items))
+            1 for npc in self.npcs if npc.mission_items and self.player.has_all(npc.mission_items))
 
         # Ensure step limit isn't exceeded in key areas
         for loc in self._locations.values():
             if loc.steps_allowed is not None and self.moves_made >= loc.steps_allowed:
-                print(f"You exceeded the step limit in {loc.brief_description}.")
+                self.output.write(f"You exceeded the step limit in {loc.brief_description}.")
                 return False
 
         return completed_tasks >= 2
@@ -437,13 +527,12 @@ if __name__ == "__main__":
         'disable': ['R1705', 'E9998', 'E9999']
     })
 
+    # Warnings, errors and any enabled debug output go to stderr, apart from the game text
+    logging.basicConfig(format="%(name)s: %(levelname)s: %(message)s")
+
     game_log = EventList()  # This is REQUIRED as one of the baseline requirements
-    game = AdventureGame('game_data.json', 0)  # load data, setting initial location ID to 1
-    menu = ["look", "inventory", "score", "undo", "log", "quit"]  # Regular menu options available at each location
+    game = AdventureGame('game_data.json', 0, game_log)  # load data, setting initial location ID to 1
     while game.ongoing:
         location = game.get_location()
-        choice = input("Enter action: ").lower().strip()
-        if choice in menu:
-            game.handle_command(choice, game_log)
-        else:
-            game.handle_special_command(choice)
+        choice = normalize_input(input("Enter action: "))
+        game.handle_command(choice, game_log)
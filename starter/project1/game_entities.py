@@ -18,21 +18,26 @@ please consult our Course Syllabus.
 
 This file is Copyright (c) 2025 CSC111 Teaching Team
 """
+from collections import Counter, deque
 from dataclasses import dataclass
-from typing import Optional, List, Dict
+from typing import Iterable, Iterator, Optional, List, Dict
 
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     """A location in our text adventure game world.
 
+    Locations are never changed once the world is built, so one world's locations can be shared
+    by many game sessions. What a session changes (where items lie, which locations have been
+    visited) is kept in its World's placements and visited set instead.
+
     Instance Attributes:
         - id_num: The unique id number of the location.
         - brief_description: A short description for the location that has been revisited.
         - long_description: A detailed description for the location when visited for the first time.
         - available_commands: A dictionary mapping valid commands to target location id.
-        - items: A list of item names available at this location.
-        - visited: A boolean value indicating whether the location has been visited or not.
+        - exits: The movement commands of available_commands, case-folded, mapped to existing target location ids.
+        - items: The names of the items listed at this location in the game data.
         - rooms_contained: A list of rooms that belong to this location.
         - condition_to_unlock: A string indicating the required condition to access this location.
         - steps_allowed: The number of steps allowed in this location before restrictions apply.
@@ -49,8 +54,8 @@ class Location:
     brief_description: str
     long_description: str
     available_commands: dict[str, int]
-    items: list[str]
-    visited: bool = False
+    exits: dict[str, int]
+    items: set[str]
     rooms_contained: Optional[List[str]] = None
     condition_to_unlock: Optional[str] = None
     steps_allowed: Optional[int] = None
@@ -61,7 +66,7 @@ class Location:
     """
     def __init__(self, location_id: int, brief_description: str, long_description: str,
                  available_commands: dict[str, int], items: Optional[list[str]] = None,
-                 visited: bool = False, rooms_contained: Optional[list[str]] = None,
+                 rooms_contained: Optional[list[str]] = None,
                  condition_to_unlock: Optional[str] = None, steps_allowed: Optional[int] = None,
                  npc: Optional[str] = None, puzzle: Optional[str] = None) -> None:
         """Initialize a new location.
@@ -70,15 +75,15 @@ class Location:
         self.brief_description = brief_description
         self.long_description = long_description
         self.available_commands = available_commands
-        self.items = items if items else []
-        self.visited = visited
+        self.exits = {}
+        self.items = set(items) if items else set()
         self.rooms_contained = rooms_contained
         self.condition_to_unlock = condition_to_unlock
         self.steps_allowed = steps_allowed
         self.npc = npc
         self.puzzle = puzzle
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     """An item in our text adventure game world.
 
@@ -109,7 +114,56 @@ class Item:
     coins: Optional[int] = None
 
 
-@dataclass
+class ItemCatalog:
+    """Every item defined in the game, looked up by exact or case-insensitive name.
+
+    When several items share a name, lookups return the first one defined.
+
+    Instance Attributes:
+        - items: All the items, in the order they were defined.
+        - by_name: A mapping from item name to the item.
+        - by_folded_name: A mapping from case-folded item name to the item.
+
+    Representation Invariants:
+        - all(item in self.items for item in self.by_name.values())
+        - all(name.casefold() in self.by_folded_name for name in self.by_name)
+    """
+    items: list[Item]
+    by_name: dict[str, Item]
+    by_folded_name: dict[str, Item]
+
+    def __init__(self, items: Optional[Iterable[Item]] = None) -> None:
+        """Initialize a catalog of the given items."""
+        self.items = []
+        self.by_name = {}
+        self.by_folded_name = {}
+        for item in items or []:
+            self.add(item)
+
+    def __iter__(self) -> Iterator[Item]:
+        """Return an iterator over all the items, in the order they were defined."""
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        """Return the number of items in the catalog."""
+        return len(self.items)
+
+    def add(self, item: Item) -> None:
+        """Add the given item to the catalog."""
+        self.items.append(item)
+        self.by_name.setdefault(item.name, item)
+        self.by_folded_name.setdefault(item.name.casefold(), item)
+
+    def get(self, name: str) -> Optional[Item]:
+        """Return the item with exactly the given name, or None if there is none."""
+        return self.by_name.get(name)
+
+    def find(self, name: str) -> Optional[Item]:
+        """Return the item whose name matches the given name ignoring case, or None if there is none."""
+        return self.by_folded_name.get(name.casefold())
+
+
+@dataclass(slots=True)
 class NPC:
     """Represents the Non-Player Character in the game.
 
@@ -137,18 +191,450 @@ class NPC:
     selling_items: Optional[Dict[str, int]] = None
 
 
+class StringPool:
+    """A pool of the distinct strings used by one game world, each with a small integer id.
+
+    The pool gives ArrayLocations small integer ids for exit commands and NPC names, and
+    interning every copy of a string through it keeps only one copy of strings that are
+    repeated across records. It does not speed up matching player input, which is never
+    pooled, so looking a command up still compares its characters.
+
+    Instance Attributes:
+        - strings: Every pooled string, at the index given by its id.
+        - ids: A mapping from each pooled string to its id.
+
+    Representation Invariants:
+        - all(self.strings[string_id] == string for string, string_id in self.ids.items())
+        - len(self.strings) == len(self.ids)
+    """
+    strings: list[str]
+    ids: dict[str, int]
+
+    def __init__(self) -> None:
+        """Initialize an empty string pool."""
+        self.strings = []
+        self.ids = {}
+
+    def __len__(self) -> int:
+        """Return the number of distinct strings in the pool."""
+        return len(self.strings)
+
+    def __getitem__(self, string_id: int) -> str:
+        """Return the string with the given id."""
+        return self.strings[string_id]
+
+    def id_of(self, string: str) -> int:
+        """Return the id of the given string, adding it to the pool if it is not already there."""
+        string_id = self.ids.get(string)
+        if string_id is None:
+            string_id = self.ids[string] = len(self.strings)
+            self.strings.append(string)
+        return string_id
+
+    def intern(self, string: Optional[str]) -> Optional[str]:
+        """Return the pooled copy of the given string, adding it to the pool if needed.
+        None (and any other non-string value) is returned unchanged."""
+        if not isinstance(string, str):
+            return string
+        return self.strings[self.id_of(string)]
+
+    def intern_all(self, strings: Optional[Iterable[str]]) -> Optional[list[str]]:
+        """Return a list of the pooled copies of the given strings, or None if strings is None."""
+        if strings is None:
+            return None
+        return [self.intern(string) for string in strings]
+
+
+class ItemPlacements:
+    """An index of where every item not carried by the player currently lies in the world.
+
+    Instance Attributes:
+        - by_location: A mapping from location id to the names of the items at that location.
+        - by_item: A mapping from item name to the id of the location the item is at.
+        - changes: If not None, (item name, id of the location it was at before, or None) is
+          appended to this list for every item placed or removed (see proj1_undo.UndoHistory).
+
+    Representation Invariants:
+        - all(name in self.by_location[loc] for name, loc in self.by_item.items())
+        - all(self.by_item[name] == loc for loc in self.by_location for name in self.by_location[loc])
+    """
+    by_location: dict[int, set[str]]
+    by_item: dict[str, int]
+    changes: Optional[list[tuple[str, Optional[int]]]]
+
+    def __init__(self) -> None:
+        """Initialize an empty item placement index."""
+        self.by_location = {}
+        self.by_item = {}
+        self.changes = None
+
+    def items_at(self, location_id: int) -> set[str]:
+        """Return the (live) set of item names at the given location."""
+        items = self.by_location.get(location_id)
+        if items is None:
+            items = self.by_location[location_id] = set()
+        return items
+
+    def location_of(self, item_name: str) -> Optional[int]:
+        """Return the id of the location the given item is at, or None if it is not placed anywhere."""
+        return self.by_item.get(item_name)
+
+    def place(self, item_name: str, location_id: int) -> None:
+        """Place the given item at the given location, removing it from wherever it was before."""
+        previous = self._unlink(item_name)
+        self.items_at(location_id).add(item_name)
+        self.by_item[item_name] = location_id
+        if self.changes is not None:
+            self.changes.append((item_name, previous))
+
+    def remove(self, item_name: str) -> Optional[int]:
+        """Remove the given item from the world and return the id of the location it was at, if any."""
+        location_id = self._unlink(item_name)
+        if self.changes is not None and location_id is not None:
+            self.changes.append((item_name, location_id))
+        return location_id
+
+    def _unlink(self, item_name: str) -> Optional[int]:
+        """Remove the given item from both indexes and return the id of the location it was at, if any."""
+        location_id = self.by_item.pop(item_name, None)
+        if location_id is not None:
+            self.by_location[location_id].discard(item_name)
+        return location_id
+
+
+class PlacementOverlay:
+    """The item placements of one game session, stored as their differences from the placements of
+    the world the session is played on, which are never changed.
+
+    It has the same methods as ItemPlacements, but items_at returns a new set rather than a live one.
+
+    Instance Attributes:
+        - base: The placements of the shared world.
+        - moved: A mapping from each item whose location differs from its location in base to its
+          current location, or None if it is not lying anywhere.
+        - changes: If not None, (item name, id of the location it was at before, or None) is
+          appended to this list for every item placed or removed (see proj1_undo.UndoHistory).
+
+    Representation Invariants:
+        - all(self.base.location_of(name) != loc for name, loc in self.moved.items())
+    """
+    base: ItemPlacements
+    moved: dict[str, Optional[int]]
+    changes: Optional[list[tuple[str, Optional[int]]]]
+    # Private Instance Attributes:
+    #   - _arrived: a mapping from location id to the names of the moved items now at that location.
+    _arrived: dict[int, set[str]]
+
+    def __init__(self, base: ItemPlacements) -> None:
+        """Initialize an overlay with no differences from the given placements."""
+        self.base = base
+        self.moved = {}
+        self.changes = None
+        self._arrived = {}
+
+    @property
+    def by_item(self) -> dict[str, int]:
+        """Return a new mapping from item name to the id of the location the item is at."""
+        by_item = {name: loc for name, loc in self.base.by_item.items() if name not in self.moved}
+        by_item.update((name, loc) for name, loc in self.moved.items() if loc is not None)
+        return by_item
+
+    def items_at(self, location_id: int) -> set[str]:
+        """Return a new set of the names of the items at the given location."""
+        items = {name for name in self.base.by_location.get(location_id, ()) if name not in self.moved}
+        items.update(self._arrived.get(location_id, ()))
+        return items
+
+    def location_of(self, item_name: str) -> Optional[int]:
+        """Return the id of the location the given item is at, or None if it is not placed anywhere."""
+        if item_name in self.moved:
+            return self.moved[item_name]
+        return self.base.location_of(item_name)
+
+    def place(self, item_name: str, location_id: int) -> None:
+        """Place the given item at the given location, removing it from wherever it was before."""
+        previous = self._move(item_name, location_id)
+        if self.changes is not None:
+            self.changes.append((item_name, previous))
+
+    def remove(self, item_name: str) -> Optional[int]:
+        """Remove the given item from the world and return the id of the location it was at, if any."""
+        location_id = self._move(item_name, None)
+        if self.changes is not None and location_id is not None:
+            self.changes.append((item_name, location_id))
+        return location_id
+
+    def _move(self, item_name: str, location_id: Optional[int]) -> Optional[int]:
+        """Move the given item to the given location (or out of the world, if it is None) and return
+        the id of the location it was at, if any."""
+        previous = self.location_of(item_name)
+        if item_name in self.moved and previous is not None:
+            self._arrived[previous].discard(item_name)
+        if location_id == self.base.location_of(item_name):
+            self.moved.pop(item_name, None)
+        else:
+            self.moved[item_name] = location_id
+            if location_id is not None:
+                self._arrived.setdefault(location_id, set()).add(item_name)
+        return previous
+
+    def restore(self, moved: dict[str, Optional[int]]) -> None:
+        """Set the differences from base to the given ones (a copy of an earlier self.moved), in time
+        proportional to their number. The change is not recorded in changes."""
+        self.moved = dict(moved)
+        self._arrived = {}
+        for item_name, location_id in self.moved.items():
+            if location_id is not None:
+                self._arrived.setdefault(location_id, set()).add(item_name)
+
+
+class VisitedSet:
+    """The ids of the locations visited in one game session, stored as a bitset.
+
+    The bitset only grows as far as the largest visited id, so a new session's set is empty.
+    Iterating over the set yields the ids in increasing order.
+    """
+    # Private Instance Attributes:
+    #   - _bits: bit (id % 8) of byte (id // 8) is set if the location with that id has been visited.
+    _bits: bytearray
+
+    def __init__(self, bits: bytes = b'') -> None:
+        """Initialize a set from the given bitset (by default, an empty set)."""
+        self._bits = bytearray(bits)
+
+    def __contains__(self, location_id: int) -> bool:
+        """Return whether the location with the given id has been visited."""
+        index = location_id >> 3
+        return index < len(self._bits) and bool(self._bits[index] & (1 << (location_id & 7)))
+
+    def __iter__(self) -> Iterator[int]:
+        """Return an iterator over the visited ids, in increasing order."""
+        for index, byte in enumerate(self._bits):
+            if byte:
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield (index << 3) | bit
+
+    def __len__(self) -> int:
+        """Return the number of visited locations."""
+        return sum(byte.bit_count() for byte in self._bits)
+
+    def add(self, location_id: int) -> None:
+        """Mark the location with the given id as visited."""
+        index = location_id >> 3
+        if index >= len(self._bits):
+            self._bits.extend(bytes(index + 1 - len(self._bits)))
+        self._bits[index] |= 1 << (location_id & 7)
+
+    def discard(self, location_id: int) -> None:
+        """Mark the location with the given id as not visited."""
+        index = location_id >> 3
+        if index < len(self._bits):
+            self._bits[index] &= ~(1 << (location_id & 7))
+
+    def to_bytes(self) -> bytes:
+        """Return the bitset, which VisitedSet(bits) turns back into an equal set."""
+        return bytes(self._bits)
+
+    def restore(self, bits: bytes) -> None:
+        """Replace the contents of this set with the given bitset."""
+        self._bits[:] = bits
+
+
+class NPCRegistry:
+    """All the NPCs in the game, indexed by name and by the location they are at.
+
+    Iterating over the registry yields the NPCs in the order they were added. Sessions spawned from
+    one world share its registry, so it is never changed once the game has started.
+
+    Instance Attributes:
+        - by_name: A mapping from NPC name to the NPC.
+        - by_location: A mapping from location id to the NPCs at that location, in the order they were added.
+
+    Representation Invariants:
+        - all(npc in self.by_location[npc.location] for npc in self.by_name.values() if npc.location is not None)
+        - all(npc.location == loc for loc in self.by_location for npc in self.by_location[loc])
+    """
+    by_name: dict[str, NPC]
+    by_location: dict[int, list[NPC]]
+
+    def __init__(self, npcs: Optional[list[NPC]] = None) -> None:
+        """Initialize a registry containing the given NPCs."""
+        self.by_name = {}
+        self.by_location = {}
+        for npc in npcs or []:
+            self.add(npc)
+
+    def __iter__(self) -> Iterator[NPC]:
+        """Return an iterator over every NPC in the registry."""
+        return iter(self.by_name.values())
+
+    def __len__(self) -> int:
+        """Return the number of NPCs in the registry."""
+        return len(self.by_name)
+
+    def add(self, npc: NPC) -> None:
+        """Add the given NPC to the registry, replacing any NPC with the same name."""
+        if npc.name in self.by_name:
+            self.remove(npc.name)
+        self.by_name[npc.name] = npc
+        if npc.location is not None:
+            self.by_location.setdefault(npc.location, []).append(npc)
+
+    def remove(self, name: str) -> Optional[NPC]:
+        """Remove and return the NPC with the given name, or return None if there is no such NPC."""
+        npc = self.by_name.pop(name, None)
+        if npc is not None and npc.location is not None:
+            self._unlink(npc)
+        return npc
+
+    def get(self, name: str) -> Optional[NPC]:
+        """Return the NPC with the given name, or None if there is no such NPC."""
+        return self.by_name.get(name)
+
+    def at(self, location_id: int) -> list[NPC]:
+        """Return the NPCs at the given location."""
+        return self.by_location.get(location_id, [])
+
+    def first_at(self, location_id: int) -> Optional[NPC]:
+        """Return the first NPC added at the given location, or None if nobody is there."""
+        npcs = self.by_location.get(location_id)
+        return npcs[0] if npcs else None
+
+    def _unlink(self, npc: NPC) -> None:
+        """Remove the given NPC from the location index."""
+        here = self.by_location[npc.location]
+        here.remove(npc)
+        if not here:
+            del self.by_location[npc.location]
+
+
 # Note: Other entities you may want to add, depending on your game plan:
 # - Puzzle class to represent special locations (could inherit from Location class if it seems suitable)
 # - Player class
 # etc.
 
-@dataclass
+class Inventory:
+    """The items carried by the player, kept in the order they were picked up.
+
+    Several items may share a name. Membership tests, per-name counts and removal by name
+    take constant time.
+
+    Instance Attributes:
+        - by_order: A mapping from an increasing sequence number to each carried item, in insertion order.
+        - by_name: A mapping from item name to the sequence numbers of the carried items with that name,
+          oldest first.
+        - changes: If not None, (sequence number, None) is appended to this list for every item added,
+          and (sequence number, item) for every item removed (see proj1_undo.UndoHistory).
+
+    Representation Invariants:
+        - all(len(seqs) > 0 for seqs in self.by_name.values())
+        - sum(len(seqs) for seqs in self.by_name.values()) == len(self.by_order)
+        - all(self.by_order[seq].name == name for name in self.by_name for seq in self.by_name[name])
+    """
+    by_order: dict[int, Item]
+    by_name: dict[str, deque[int]]
+    changes: Optional[list[tuple[int, Optional[Item]]]]
+    # Private Instance Attributes:
+    #   - _next_seq: the sequence number the next added item will get.
+    _next_seq: int
+
+    def __init__(self, items: Optional[Iterable[Item]] = None) -> None:
+        """Initialize an inventory holding the given items, in order."""
+        self.by_order = {}
+        self.by_name = {}
+        self.changes = None
+        self._next_seq = 0
+        for item in items or []:
+            self.add(item)
+
+    def __iter__(self) -> Iterator[Item]:
+        """Return an iterator over the carried items, in the order they were added."""
+        return iter(self.by_order.values())
+
+    def __len__(self) -> int:
+        """Return the number of carried items."""
+        return len(self.by_order)
+
+    def __contains__(self, item_name: str) -> bool:
+        """Return whether an item with the given name is carried."""
+        return item_name in self.by_name
+
+    def add(self, item: Item) -> None:
+        """Add the given item to the end of the inventory."""
+        self.by_order[self._next_seq] = item
+        self.by_name.setdefault(item.name, deque()).append(self._next_seq)
+        if self.changes is not None:
+            self.changes.append((self._next_seq, None))
+        self._next_seq += 1
+
+    def remove(self, item_name: str) -> Optional[Item]:
+        """Remove and return the earliest added item with the given name, or return None if there is none."""
+        seqs = self.by_name.get(item_name)
+        if not seqs:
+            return None
+        seq = seqs.popleft()
+        if not seqs:
+            del self.by_name[item_name]
+        item = self.by_order.pop(seq)
+        if self.changes is not None:
+            self.changes.append((seq, item))
+        return item
+
+    def discard_newest(self, seq: int) -> None:
+        """Remove the carried item with the given sequence number, which must be the newest item with its name.
+
+        Preconditions:
+            - seq in self.by_order
+            - self.by_name[self.by_order[seq].name][-1] == seq
+        """
+        item = self.by_order.pop(seq)
+        seqs = self.by_name[item.name]
+        seqs.pop()
+        if not seqs:
+            del self.by_name[item.name]
+
+    def restore_oldest(self, seq: int, item: Item) -> None:
+        """Put back the given item, removed earlier with the given sequence number, as the oldest item
+        with its name. The inventory keeps its order; if the item was not the last one added, the order
+        is rebuilt, in time linear in the size of the inventory.
+
+        Preconditions:
+            - seq not in self.by_order
+            - all(seq < other for other in self.by_name.get(item.name, []))
+        """
+        newest = next(reversed(self.by_order), None)
+        self.by_order[seq] = item
+        self.by_name.setdefault(item.name, deque()).appendleft(seq)
+        if newest is not None and seq < newest:
+            self.by_order = dict(sorted(self.by_order.items()))
+
+    def reset(self, entries: Iterable[tuple[int, Item]]) -> None:
+        """Replace the carried items with the given (sequence number, item) pairs, in increasing
+        sequence number order."""
+        self.by_order = dict(entries)
+        self.by_name = {}
+        for seq, item in self.by_order.items():
+            self.by_name.setdefault(item.name, deque()).append(seq)
+        if self.by_order:
+            self._next_seq = max(self._next_seq, max(self.by_order) + 1)
+
+    def count(self, item_name: str) -> int:
+        """Return how many items with the given name are carried."""
+        return len(self.by_name.get(item_name, ()))
+
+    def has_all(self, item_names: Iterable[str]) -> bool:
+        """Return whether every one of the given item names is carried, as many times as it is listed."""
+        return all(self.count(name) >= needed for name, needed in Counter(item_names).items())
+
+
+@dataclass(slots=True)
 class Player:
     """Represents the player in the game.
 
     Instance Attributes:
         - current_location: The id of the location where the player is currently located.
-        - inventory: A list of items the player is carrying.
+        - inventory: The items the player is carrying.
         - score: The player's current score.
         - coins: The number of coins the player has collected.
 
@@ -158,34 +644,33 @@ class Player:
         - self.coins >= 0
     """
     current_location: int
-    inventory: List[Item]
+    inventory: Inventory
     score: int
     coins: int = 0
 
-    def __init__(self, start_location: int, inventory: list, coins: int, score: int) -> None:
+    def __init__(self, start_location: int, inventory: Iterable[Item], coins: int, score: int) -> None:
         self.current_location = start_location
-        self.inventory = inventory
+        self.inventory = Inventory(inventory)
         self.coins = coins
         self.score = score
 
     def add_item(self, item: Item) -> None:
         """Add an item to the player's inventory."""
-        self.inventory.append(item)
+        self.inventory.add(item)
 
     def remove_item(self, item_name: str) -> Optional[Item]:
         """Remove an item from the player's inventory by name."""
-        for item in self.inventory:
-            if item.name == item_name:
-                self.inventory.remove(item)
-                return item
-        return None
+        return self.inventory.remove(item_name)
 
     def has_item(self, item_name: str) -> bool:
         """Check if the player has an item with the given name."""
-        return any(item.name == item_name for item in self.inventory)
+        return item_name in self.inventory
+
+    def has_all(self, item_names: Iterable[str]) -> bool:
+        """Check if the player has every one of the given items."""
+        return self.inventory.has_all(item_names)
 
 if __name__ == "__main__":
-    pass
     # When you are ready to check your work with python_ta, uncomment the following lines.
     # (Delete the "#" and space before each line.)
     # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
@@ -194,3 +679,12 @@ if __name__ == "__main__":
     #     'max-line-length': 120,
     #     'disable': ['R1705', 'E9998', 'E9999']
     # })
+
+    # A name listed twice needs two carried items with that name, not just one
+    carrier = Player(0, [Item("coin", 1, 0)], 0, 0)
+    assert carrier.has_all(["coin"])
+    assert not carrier.has_all(["coin", "coin"])
+    carrier.inventory.add(Item("coin", 2, 0))
+    assert carrier.has_all(["coin", "coin"])
+    assert not carrier.has_all(["coin", "coin", "coin"])
+    assert carrier.has_all([])
@@ -0,0 +1,218 @@
+"""CSC111 Project 1: Text Adventure Game - Batch Walkthrough Runner
+
+Module Description
+==================
+
+This module runs many recorded walkthroughs as regression checks, spread over a pool of worker
+processes. Each case names a game data file, a starting location, the commands to run and,
+optionally, the id log the simulation is expected to produce.
+
+Cases are read from a JSONL file (one case per line) or from a directory, whose *.json files
+each hold one case and whose *.jsonl files hold one case per line, read in file name order. A
+case is a JSON object with the keys "game_data", "start_location", "commands" and, optionally,
+"expected_log" and "name". A relative game_data path is relative to the file the case is in.
+
+Each worker process loads each game data file once, and plays every case on a world spawned
+from it. Results are returned in the order the cases were read.
+
+Run this module with a case file or directory to check it, or with no arguments to check the
+walkthroughs of proj1_simulation many times over.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from proj1_output import NullSink
+from proj1_simulation import DEMO_WALKTHROUGHS, AdventureGameSimulation
+from proj1_world_loader import World, load_world
+
+
+@dataclass(frozen=True)
+class WalkthroughCase:
+    """One recorded walkthrough to check.
+
+    Instance Attributes:
+        - name: The name reported for this case.
+        - game_data: The name of the game data file the walkthrough is played on.
+        - start_location: The id of the location the walkthrough starts at.
+        - commands: The commands of the walkthrough, in order.
+        - expected_log: The id log the simulation should produce, or None to only check that it runs.
+    """
+    name: str
+    game_data: str
+    start_location: int
+    commands: tuple[str, ...]
+    expected_log: Optional[tuple[int, ...]] = None
+
+
+@dataclass(frozen=True)
+class CaseResult:
+    """The result of running one walkthrough case.
+
+    Instance Attributes:
+        - name: The name of the case.
+        - id_log: The id log the simulation produced, or None if it raised an error.
+        - expected_log: The id log the case expected, or None if it did not give one.
+        - seconds: The time the simulation took, not counting loading the world.
+        - error: The error the simulation raised, or None.
+    """
+    name: str
+    id_log: Optional[tuple[int, ...]]
+    expected_log: Optional[tuple[int, ...]]
+    seconds: float
+    error: Optional[str] = None
+
+    def passed(self) -> bool:
+        """Return whether the simulation ran and produced the expected id log (if one was given)."""
+        return self.error is None and (self.expected_log is None or self.id_log == self.expected_log)
+
+
+@dataclass
+class BatchReport:
+    """The results of running a batch of walkthrough cases.
+
+    Instance Attributes:
+        - results: The result of every case, in the order the cases were given.
+        - seconds: The wall-clock time the whole batch took.
+        - workers: The number of worker processes used.
+    """
+    results: list[CaseResult]
+    seconds: float
+    workers: int
+
+    def failures(self) -> list[CaseResult]:
+        """Return the results of the cases that did not pass, in order."""
+        return [result for result in self.results if not result.passed()]
+
+    def commands_per_second(self, cases: list[WalkthroughCase]) -> float:
+        """Return the number of commands of the given cases (the batch's cases) run per second."""
+        return sum(len(case.commands) for case in cases) / self.seconds
+
+
+def case_from_record(record: dict[str, Any], base_dir: str, default_name: str) -> WalkthroughCase:
+    """Return the case described by the given JSON record, read from a file in base_dir."""
+    expected_log = record.get('expected_log')
+    return WalkthroughCase(
+        name=record.get('name', default_name),
+        game_data=os.path.join(base_dir, record['game_data']),
+        start_location=record['start_location'],
+        commands=tuple(record['commands']),
+        expected_log=None if expected_log is None else tuple(expected_log)
+    )
+
+
+def _cases_in_file(filename: str) -> Iterator[WalkthroughCase]:
+    """Yield the cases in the given .json or .jsonl file."""
+    base_dir = os.path.dirname(filename)
+    with open(filename, 'r') as f:
+        if filename.endswith('.jsonl'):
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    yield case_from_record(json.loads(line), base_dir, f"{filename}:{line_number}")
+        else:
+            yield case_from_record(json.load(f), base_dir, filename)
+
+
+def load_cases(path: str) -> list[WalkthroughCase]:
+    """Return the cases in the given JSONL file or directory, in order."""
+    if not os.path.isdir(path):
+        return list(_cases_in_file(path))
+    cases = []
+    for entry in sorted(os.listdir(path)):
+        if entry.endswith(('.json', '.jsonl')):
+            cases.extend(_cases_in_file(os.path.join(path, entry)))
+    return cases
+
+
+# The worlds loaded by this worker process, keyed by game data file name
+_WORLDS: dict[str, World] = {}
+
+
+def _worker_world(game_data_file: str) -> World:
+    """Return a new session world for the given game data file, loading the file only the first
+    time this process needs it."""
+    world = _WORLDS.get(game_data_file)
+    if world is None:
+        world = _WORLDS[game_data_file] = load_world(game_data_file)
+    return world.spawn()
+
+
+def run_case(case: WalkthroughCase) -> CaseResult:
+    """Run the given case's walkthrough and return its result."""
+    try:
+        _worker_world(case.game_data)
+        start = time.perf_counter()
+        simulation = AdventureGameSimulation(case.game_data, case.start_location, list(case.commands),
+                                             output=NullSink(), world_loader=_worker_world)
+        id_log = tuple(simulation.get_id_log())
+        seconds = time.perf_counter() - start
+    except Exception as error:  # report the error as this case's result, and keep running the batch
+        return CaseResult(case.name, None, case.expected_log, 0.0, f"{type(error).__name__}: {error}")
+    return CaseResult(case.name, id_log, case.expected_log, seconds)
+
+
+def run_batch(cases: list[WalkthroughCase], max_workers: Optional[int] = None, chunksize: int = 64) -> BatchReport:
+    """Run the given cases over a pool of max_workers processes (by default, one per CPU) and
+    return the report. Cases are sent to the workers chunksize at a time."""
+    workers = max_workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run_case, cases, chunksize=chunksize))
+    return BatchReport(results, time.perf_counter() - start, workers)
+
+
+def print_report(report: BatchReport, cases: list[WalkthroughCase], max_failures: int = 20) -> None:
+    """Print a summary of the given report of the given cases, with the first max_failures failures."""
+    failures = report.failures()
+    timings = sorted(result.seconds for result in report.results)
+    print(f"{len(report.results) - len(failures)}/{len(report.results)} cases passed in {report.seconds:.2f} s "
+          f"on {report.workers} worker(s): {len(report.results) / report.seconds:,.0f} cases/s, "
+          f"{report.commands_per_second(cases):,.0f} commands/s")
+    if timings:
+        print(f"Per-case time: median {timings[len(timings) // 2] * 1000:.2f} ms, "
+              f"max {timings[-1] * 1000:.2f} ms")
+    for result in failures[:max_failures]:
+        if result.error is not None:
+            print(f"ERROR {result.name}: {result.error}")
+        else:
+            print(f"MISMATCH {result.name}: expected {list(result.expected_log)}, got {list(result.id_log)}")
+    if len(failures) > max_failures:
+        print(f"... and {len(failures) - max_failures} more failures")
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+
+    if len(sys.argv) > 1:
+        batch = load_cases(sys.argv[1])
+    else:
+        # The walkthroughs run by proj1_simulation, many times over
+        batch = [WalkthroughCase(f"{title} #{i}", 'game_data.json', start_id, tuple(commands), tuple(expected))
+                 for i in range(2000) for title, (start_id, commands, expected) in DEMO_WALKTHROUGHS.items()]
+
+    batch_report = run_batch(batch)
+    print_report(batch_report, batch)
+    sys.exit(0 if not batch_report.failures() else 1)
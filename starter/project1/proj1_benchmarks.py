@@ -0,0 +1,270 @@
+"""CSC111 Project 1: Text Adventure Game - Benchmarks
+
+Module Description
+==================
+
+This module contains benchmarks for the game engine. Run it directly to print every report.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import dataclasses
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Mapping
+from typing import Any, Callable, Optional
+
+from game_entities import Location, Item, NPC, Player, VisitedSet
+from proj1_event_logger import ArrayEventList, Event
+from proj1_output import NullSink
+from proj1_pathfinding import MOVE_PREFIX, PathFinder
+from proj1_simulation import AdventureGameSimulation
+from proj1_world_loader import load_world
+from proj1_world_stream import write_synthetic_game_data
+
+
+def _traced_bytes_per_object(make: Callable[[int], Any], n: int) -> float:
+    """Return the average number of bytes allocated by calling make(i) for each i in range(n),
+    keeping every result alive."""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        objects = [make(i) for i in range(n)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # The list holding the objects costs one pointer per object
+    return (after - before) / len(objects) - 8
+
+
+_PLAIN_CLASSES: dict[type, type] = {}
+
+
+def _with_dict(instance: Any) -> Any:
+    """Return a copy of the given dataclass instance as an object of a plain (non-slotted) class,
+    storing the same attribute values in a per-instance __dict__, as the entities did before they
+    were slotted."""
+    cls = type(instance)
+    plain_cls = _PLAIN_CLASSES.get(cls)
+    if plain_cls is None:
+        plain_cls = _PLAIN_CLASSES[cls] = type(cls.__name__ + 'WithDict', (), {})
+    obj = plain_cls()
+    for f in dataclasses.fields(instance):
+        setattr(obj, f.name, getattr(instance, f.name))
+    return obj
+
+# One sample of each entity; attribute values are shared between copies, so only the per-object
+# overhead is measured.
+_SAMPLE_ENTITIES = {
+    'Location': Location(0, "brief", "long", {}, ["item"], rooms_contained=[], npc="npc"),
+    'Item': Item("item", 0, 0),
+    'NPC': NPC("npc", location=0, mission_items=[], selling_items={}),
+    'Player': Player(0, [], 0, 0),
+    'Event': Event(0, "description", event_type="move")
+}
+
+
+def entity_memory_report(n: int = 100_000) -> dict[str, tuple[float, float]]:
+    """Return a mapping from each entity class name to (bytes per instance with a __dict__,
+    bytes per slotted instance), each averaged over n instances."""
+    report = {}
+    for name, sample in _SAMPLE_ENTITIES.items():
+        _with_dict(sample)  # create the plain class before measuring
+        dict_bytes = _traced_bytes_per_object(lambda _: _with_dict(sample), n)
+        slotted_bytes = _traced_bytes_per_object(lambda _: _copy(sample), n)
+        report[name] = (dict_bytes, slotted_bytes)
+    return report
+
+
+def _copy(instance: Any) -> Any:
+    """Return a shallow copy of the given slotted instance without calling its __init__."""
+    cls = type(instance)
+    obj = cls.__new__(cls)
+    for f in dataclasses.fields(instance):
+        object.__setattr__(obj, f.name, getattr(instance, f.name))
+    return obj
+
+
+def _walk(locations: Mapping[int, Location], visited: VisitedSet, start: int, num_moves: int,
+          span: Optional[int] = None) -> int:
+    """Make num_moves moves from the given start location the way AdventureGame's movement
+    handlers do (look up the exit, then the target location, then mark it visited), and return
+    the id of the final location. The moves all go north, or, if span is given, go span moves
+    north and then span moves south, over and over."""
+    current = start
+    for move in range(num_moves):
+        command = "go south" if span is not None and move // span % 2 == 1 else "go north"
+        current = locations[current].exits.get(command)
+        target = locations[current]
+        if target.id_num not in visited:
+            visited.add(target.id_num)
+    return current
+
+
+def world_store_report(num_locations: int = 200_000, num_moves: int = 1_000_000,
+                       span: int = 1000) -> dict[str, tuple[float, float, float]]:
+    """Return a mapping from each location store ("objects", the dict of Location dataclasses, and
+    "arrays", the ArrayLocations backend) to (MiB held by the loaded world, moves per second around
+    the ring, moves per second pacing back and forth over span locations), for a synthetic ring
+    world with num_locations locations. Every move around the ring reaches a location not seen
+    before, while pacing revisits the same few locations, as a game does."""
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, 'synthetic_game_data.json')
+        write_synthetic_game_data(filename, num_locations)
+        for store, compact in (('objects', False), ('arrays', True)):
+            gc.collect()
+            tracemalloc.start()
+            try:
+                world = load_world(filename, compact=compact)
+                held, _ = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            start = time.perf_counter()
+            _walk(world.locations, world.visited, 0, num_moves)
+            ring_rate = num_moves / (time.perf_counter() - start)
+            start = time.perf_counter()
+            _walk(world.locations, world.visited, 0, num_moves, span)
+            report[store] = (held / 2 ** 20, ring_rate, num_moves / (time.perf_counter() - start))
+            del world
+    return report
+
+
+def session_spawn_report(num_sessions: int = 100_000) -> tuple[float, float]:
+    """Return (bytes per session, microseconds per session) for spawning num_sessions session
+    worlds from the game's world with World.spawn, keeping every session alive."""
+    world = load_world('game_data.json')
+    world.spawn()
+    start = time.perf_counter()
+    bytes_per_session = _traced_bytes_per_object(lambda _: world.spawn(), num_sessions)
+    seconds = time.perf_counter() - start
+    return bytes_per_session, seconds / num_sessions * 1e6
+
+
+def synthetic_walkthrough(locations: Mapping[int, Location], start: int, num_commands: int,
+                          seed: int = 111) -> list[str]:
+    """Return num_commands valid commands for a random player starting at the given location: mostly
+    moves along exits to existing locations, with some looks, inventory checks and score checks.
+    Only exits the game runs as moves (those starting with MOVE_PREFIX) are taken."""
+    rng = random.Random(seed)
+    exits = {location_id: [(command, target) for command, target in location.exits.items()
+                           if command.startswith(MOVE_PREFIX) and target in locations]
+             for location_id, location in locations.items()}
+    commands = []
+    current = start
+    for _ in range(num_commands):
+        if rng.random() < 0.2 or not exits[current]:
+            commands.append(rng.choice(("look", "inventory", "score")))
+        else:
+            command, current = rng.choice(exits[current])
+            commands.append(command)
+    return commands
+
+
+def simulation_throughput_report(sizes: tuple[int, ...] = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6),
+                                 max_rendered: int = 10 ** 5) -> dict[int, tuple[float | None, float]]:
+    """Return a mapping from each walkthrough size in sizes to (commands per second rendering text to
+    a NullSink, commands per second headless), for synthetic walkthroughs of game_data.json. Walkthroughs
+    longer than max_rendered commands are only run headless, and their first entry is None."""
+    world = load_world('game_data.json')
+    report = {}
+    for num_commands in sizes:
+        commands = synthetic_walkthrough(world.locations, 1, num_commands)
+        rates = []
+        for headless in (False, True):
+            if not headless and num_commands > max_rendered:
+                rates.append(None)
+                continue
+            gc.collect()
+            start = time.perf_counter()
+            AdventureGameSimulation('game_data.json', 1, commands, output=NullSink(), events=ArrayEventList(),
+                                    world_loader=lambda _: world.spawn(), headless=headless)
+            rates.append(num_commands / (time.perf_counter() - start))
+        report[num_commands] = (rates[0], rates[1])
+    return report
+
+
+def _random_graph(num_locations: int, seed: int = 111) -> dict[int, Location]:
+    """Return num_locations locations whose exits form a ring (north and south) with one more exit
+    from each location to a random one."""
+    rng = random.Random(seed)
+    locations = {}
+    for i in range(num_locations):
+        location = Location(i, f"Room {i}", f"You are in room {i}.", {})
+        location.exits = {"go north": (i + 1) % num_locations, "go south": (i - 1) % num_locations,
+                          "go upstairs": rng.randrange(num_locations)}
+        locations[i] = location
+    return locations
+
+
+def pathfinding_report(num_locations: int = 100_000, num_goals: int = 16,
+                       num_queries: int = 1_000_000) -> tuple[float, float, float]:
+    """Return (milliseconds to build PathFinder's first tree, including its index of entrances,
+    milliseconds per further tree, next_exit queries per second once the trees are cached) for
+    num_goals goals in a random graph of num_locations locations."""
+    locations = _random_graph(num_locations)
+    rng = random.Random(111)
+    goals = [rng.randrange(num_locations) for _ in range(num_goals)]
+    routes = PathFinder(locations)
+
+    start = time.perf_counter()
+    routes.route_tree(goals[0])
+    first_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for goal_id in goals[1:]:
+        routes.route_tree(goal_id)
+    tree_ms = (time.perf_counter() - start) * 1000 / (num_goals - 1)
+
+    queries = [(rng.randrange(num_locations), goals[rng.randrange(num_goals)]) for _ in range(num_queries)]
+    start = time.perf_counter()
+    for location_id, goal_id in queries:
+        routes.next_exit(location_id, goal_id)
+    return first_ms, tree_ms, num_queries / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+
+    print("--- Bytes per entity (with __dict__ -> slotted) ---")
+    for entity, (with_dict, slotted) in entity_memory_report().items():
+        print(f"{entity:>8}: {with_dict:7.1f} -> {slotted:7.1f}")
+
+    print("--- Location stores (200k-location ring) ---")
+    for store_name, (mib, ring_moves_per_sec, pacing_moves_per_sec) in world_store_report().items():
+        print(f"{store_name:>8}: {mib:8.1f} MiB, {ring_moves_per_sec:12,.0f} moves/s around the ring, "
+              f"{pacing_moves_per_sec:12,.0f} moves/s pacing")
+
+    print("--- Session worlds spawned from one loaded world ---")
+    spawn_bytes, spawn_us = session_spawn_report()
+    print(f"{spawn_bytes:.0f} bytes and {spawn_us:.2f} us per session (traced)")
+
+    print("--- Simulation throughput (rendered to a NullSink -> headless) ---")
+    for size, (rendered, headless_rate) in simulation_throughput_report().items():
+        rendered_text = "not run" if rendered is None else f"{rendered:,.0f}"
+        print(f"{size:>9,} commands: {rendered_text:>9} -> {headless_rate:9,.0f} commands/s")
+
+    print("--- Pathfinding (100k-location random graph) ---")
+    first_tree_ms, later_tree_ms, lookups_per_sec = pathfinding_report()
+    print(f"First tree {first_tree_ms:.0f} ms, then {later_tree_ms:.0f} ms per tree; "
+          f"{lookups_per_sec:,.0f} cached next_exit queries/s")
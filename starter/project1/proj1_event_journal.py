@@ -0,0 +1,388 @@
+"""CSC111 Project 1: Text Adventure Game - Event Journal
+
+Module Description
+==================
+
+This module contains EventJournal, an append-only on-disk log of the changes made to an
+EventList. An event list given a journal records every add_event and remove_last_event call in
+it, so a session's history survives the process that played it, and recover_event_list
+rebuilds the list from the journal on restart.
+
+Each journal is a binary file starting with JOURNAL_MAGIC, followed by records. A record is a
+1-byte record type and a 4-byte payload length, the payload, and a 4-byte CRC-32 of the type
+and payload. The record types are:
+    - STRING: defines the next string id as the UTF-8 payload. Commands, descriptions, event
+      types and item, puzzle and mission names are written once and referred to by id.
+    - ADD: an add_event call; the payload is the event's location id followed by the string ids
+      (or NO_STRING, for None) of the command and the event's fields in ADD_FIELDS.
+    - REMOVE: a remove_last_event call on a non-empty list, with an empty payload.
+
+Records are buffered and written with a single fsync (group commit) once sync_bytes of them are
+pending or sync_interval seconds have passed since the last fsync, whichever comes first. A
+background timer commits records still pending sync_interval seconds after they were added,
+so the last group of a session that goes idle is written too. A crash can lose at most the
+records of the last sync_interval seconds. A torn or corrupt record at the end of the journal
+(from a crash in the middle of a write) is dropped on recovery. A corrupt record followed by more
+records cannot come from a crash, so the journal is rejected rather than cut short there.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from typing import BinaryIO, Iterator, Optional
+
+from proj1_event_logger import Event, EventList
+
+JOURNAL_MAGIC = b'CSC111EJ\x01'
+
+STRING = 1
+ADD = 2
+REMOVE = 3
+
+# The Event fields stored as string ids in an ADD record, after the command
+ADD_FIELDS = ('description', 'next_command', 'event_type', 'affected_item', 'puzzle_completed', 'mission_completed')
+NO_STRING = -1
+
+_HEADER = struct.Struct('<BI')
+_CRC = struct.Struct('<I')
+_ADD = struct.Struct('<q' + 'i' * (1 + len(ADD_FIELDS)))
+
+
+class EventJournal:
+    """An append-only journal of the add_event and remove_last_event calls made on one EventList.
+
+    Opening an existing journal continues it: its string table is read back, and a torn record
+    at its end is truncated away. An existing file that is not a journal, or a journal with a
+    corrupt record before its last one, is never overwritten.
+
+    Instance Attributes:
+        - filename: The name of the journal file.
+        - sync_bytes: The number of pending bytes that triggers a commit.
+        - sync_interval: The number of seconds after the last commit at which the next record
+          triggers a commit.
+        - commits: The number of commits (fsyncs) made so far.
+
+    Representation Invariants:
+        - self.sync_bytes >= 0
+        - self.sync_interval >= 0
+    """
+    filename: str
+    sync_bytes: int
+    sync_interval: float
+    commits: int
+    # Private Instance Attributes:
+    #   - _file: the journal file, opened for appending, or None once closed.
+    #   - _pending: the records not yet written to the file.
+    #   - _last_commit: the time.monotonic() time of the last commit.
+    #   - _string_ids: a mapping from each string defined in the journal to its id.
+    #   - _lock: held while the pending records or the file are used, since the timer commits
+    #     from another thread.
+    #   - _timer: the timer that will commit the pending records, or None if none is scheduled.
+    _file: Optional[BinaryIO]
+    _pending: bytearray
+    _last_commit: float
+    _string_ids: dict[str, int]
+    _lock: threading.RLock
+    _timer: Optional[threading.Timer]
+
+    def __init__(self, filename: str, sync_bytes: int = 1 << 16, sync_interval: float = 0.05) -> None:
+        """Open the journal with the given file name, creating it if it does not exist.
+
+        Raise a ValueError if the file exists and is not a journal, or if a record before its last
+        one is corrupt. An empty file, or one holding only the start of JOURNAL_MAGIC (left by a
+        crash while it was created), is started afresh.
+        """
+        self.filename = filename
+        self.sync_bytes = sync_bytes
+        self.sync_interval = sync_interval
+        self.commits = 0
+        self._pending = bytearray()
+        self._string_ids = {}
+        self._lock = threading.RLock()
+        self._timer = None
+
+        valid_end = 0
+        if os.path.exists(filename):
+            with open(filename, 'rb') as f:
+                if not JOURNAL_MAGIC.startswith(f.read(len(JOURNAL_MAGIC))):
+                    raise ValueError(f"{filename} exists and is not an event journal")
+            strings = []
+            valid_end = _scan(filename, strings, [])
+            self._string_ids = {string: string_id for string_id, string in enumerate(strings)}
+        self._file = open(filename, 'r+b' if valid_end else 'wb')
+        if valid_end:
+            self._file.truncate(valid_end)
+            self._file.seek(valid_end)
+        else:
+            self._file.write(JOURNAL_MAGIC)
+            self._sync()
+        self._last_commit = time.monotonic()
+
+    def record_add(self, event: Event, command: Optional[str]) -> None:
+        """Record that the given event was added to the list with the given command."""
+        string_ids = [self._string_id(command)]
+        string_ids.extend(self._string_id(getattr(event, name)) for name in ADD_FIELDS)
+        self._append(ADD, _ADD.pack(event.id_num, *string_ids))
+
+    def record_remove(self) -> None:
+        """Record that the last event was removed from the list."""
+        self._append(REMOVE, b'')
+
+    def commit(self) -> None:
+        """Write every pending record to the journal file and wait until it is on disk."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._pending:
+                self._file.write(self._pending)
+                self._pending = bytearray()
+                self._sync()
+                self.commits += 1
+            self._last_commit = time.monotonic()
+
+    def replay(self, events: EventList) -> None:
+        """Apply every record in this journal, including pending ones, to the given empty event list.
+
+        The calls are not journaled again, even if events has a journal.
+        """
+        self.commit()
+        strings, operations = [], []
+        _scan(self.filename, strings, operations)
+
+        journal, events.journal = events.journal, None
+        try:
+            for operation in operations:
+                if operation is None:
+                    events.remove_last_event()
+                else:
+                    id_num, command_id, *field_ids = operation
+                    event = Event(id_num, "")
+                    for name, string_id in zip(ADD_FIELDS, field_ids):
+                        setattr(event, name, None if string_id == NO_STRING else strings[string_id])
+                    events.add_event(event, None if command_id == NO_STRING else strings[command_id])
+        finally:
+            events.journal = journal
+
+    def close(self) -> None:
+        """Commit every pending record and close the journal file."""
+        with self._lock:
+            if self._file is not None:
+                self.commit()
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> EventJournal:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _string_id(self, string: Optional[str]) -> int:
+        """Return the id of the given string, defining it in the journal if needed, or NO_STRING for None."""
+        if string is None:
+            return NO_STRING
+        string_id = self._string_ids.get(string)
+        if string_id is None:
+            string_id = self._string_ids[string] = len(self._string_ids)
+            self._append(STRING, string.encode('utf-8'), commit=False)
+        return string_id
+
+    def _append(self, record_type: int, payload: bytes, commit: bool = True) -> None:
+        """Add a record to the pending records, committing them if a threshold has been reached,
+        and otherwise making sure the timer will commit them."""
+        header = _HEADER.pack(record_type, len(payload))
+        with self._lock:
+            self._pending += header
+            self._pending += payload
+            self._pending += _CRC.pack(zlib.crc32(payload, zlib.crc32(header[:1])))
+            if not commit:
+                return
+            if len(self._pending) >= self.sync_bytes or time.monotonic() - self._last_commit >= self.sync_interval:
+                self.commit()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.sync_interval, self._commit_when_idle)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _commit_when_idle(self) -> None:
+        """Commit the pending records, unless the journal has been closed; called by the timer."""
+        with self._lock:
+            self._timer = None
+            if self._file is not None:
+                self.commit()
+
+    def _sync(self) -> None:
+        """Flush the journal file and fsync it."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+
+def _iter_records(data: bytes) -> Iterator[tuple[int, bytes, int]]:
+    """Yield (record type, payload, end offset) for every intact record in the given journal
+    contents, stopping at a torn or corrupt last record.
+
+    Raise a ValueError if a record other than the last one is corrupt.
+    """
+    pos = len(JOURNAL_MAGIC)
+    while pos + _HEADER.size <= len(data):
+        record_type, length = _HEADER.unpack_from(data, pos)
+        payload_start = pos + _HEADER.size
+        end = payload_start + length + _CRC.size
+        if end > len(data):
+            return
+        payload = data[payload_start:payload_start + length]
+        (crc,) = _CRC.unpack_from(data, end - _CRC.size)
+        if crc != zlib.crc32(payload, zlib.crc32(data[pos:pos + 1])):
+            if end == len(data):
+                return
+            raise ValueError(f"corrupt journal record at offset {pos}, followed by {len(data) - end} more bytes")
+        yield record_type, payload, end
+        pos = end
+
+
+def _scan(filename: str, strings: list[str], operations: list[Optional[tuple[int, ...]]]) -> int:
+    """Append the strings defined in the given journal to strings and its operations to operations
+    (an ADD record's unpacked payload, or None for a REMOVE record). Return the offset just past the
+    last intact record, or 0 if the file is not a journal.
+
+    Raise a ValueError if a record other than the last one is corrupt or of an unknown type.
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+    if not data.startswith(JOURNAL_MAGIC):
+        return 0
+
+    valid_end = len(JOURNAL_MAGIC)
+    for record_type, payload, end in _iter_records(data):
+        if record_type == STRING:
+            strings.append(payload.decode('utf-8'))
+        elif record_type == ADD:
+            operations.append(_ADD.unpack(payload))
+        elif record_type == REMOVE:
+            operations.append(None)
+        elif end == len(data):
+            break
+        else:
+            raise ValueError(f"journal record of unknown type {record_type} before offset {end}")
+        valid_end = end
+    return valid_end
+
+
+def recover_event_list(filename: str, events: Optional[EventList] = None, sync_bytes: int = 1 << 16,
+                       sync_interval: float = 0.05) -> EventList:
+    """Return the event list recorded in the journal with the given file name (rebuilt in the given
+    empty event list, or a new EventList), with the journal attached so later changes continue it.
+    If there is no such journal, a new one is created and the list is empty.
+    """
+    if events is None:
+        events = EventList()
+    journal = EventJournal(filename, sync_bytes, sync_interval)
+    journal.replay(events)
+    events.journal = journal
+    return events
+
+
+def measure_journal(num_events: int, sync_bytes: int, sync_interval: float) -> tuple[float, int]:
+    """Journal num_events add_event calls to a temporary file with the given commit thresholds, and
+    return (events journaled per second, number of commits)."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        journal = EventJournal(os.path.join(tmp_dir, 'session.journal'), sync_bytes, sync_interval)
+        events = EventList(journal)
+        start = time.perf_counter()
+        for i in range(num_events):
+            events.add_event(Event(i % 10, f"Room {i % 10}", event_type="move"), "go north")
+        journal.close()
+        return num_events / (time.perf_counter() - start), journal.commits
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+
+    # A recovered list must match the original, and a torn final record must be dropped
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'session.journal')
+        original = EventList(EventJournal(path))
+        original.add_event(Event(1, "Start", event_type=None))
+        original.add_event(Event(2, "Hall", event_type="move", puzzle_completed="Solved lock"), "go east")
+        original.add_event(Event(3, "Cafe", event_type="move"), "go north")
+        original.remove_last_event()
+        original.add_event(Event(4, "Library", event_type="pickup", affected_item="notebook"), "pick up notebook")
+        original.journal.close()
+
+        recovered = recover_event_list(path)
+        assert recovered.get_id_log() == original.get_id_log() == [1, 2, 4]
+        assert [e.next_command for e in recovered] == [e.next_command for e in original]
+        assert recovered.completed_puzzles == original.completed_puzzles
+        assert recovered.steps_taken == original.steps_taken
+        recovered.journal.close()
+
+        with open(path, 'r+b') as journal_file:
+            journal_file.truncate(os.path.getsize(path) - 3)
+        torn = recover_event_list(path)
+        assert torn.get_id_log() == [1, 2]
+        torn.add_event(Event(5, "Lab", event_type="move"), "go west")
+        torn.journal.close()
+        assert recover_event_list(path).get_id_log() == [1, 2, 5]
+
+        # A corrupt record in the middle of the journal is an error, and the records after it are kept
+        with open(path, 'rb') as journal_file:
+            intact = journal_file.read()
+        with open(path, 'r+b') as journal_file:
+            journal_file.seek(len(JOURNAL_MAGIC) + _HEADER.size)
+            journal_file.write(b'?')
+        try:
+            recover_event_list(path)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("recover_event_list accepted a journal corrupted in the middle")
+        assert os.path.getsize(path) == len(intact)
+        with open(path, 'wb') as journal_file:
+            journal_file.write(intact)
+
+        # The last group of an idle journal is committed by the timer, without another record or close()
+        idle = EventJournal(path, sync_interval=0.05)
+        idle.record_add(Event(6, "Hall", event_type="move"), "go east")
+        time.sleep(0.2)
+        assert idle.commits == 1
+        idle.close()
+
+        # A file that is not a journal is left alone
+        not_journal = os.path.join(directory, 'notes.txt')
+        with open(not_journal, 'w') as notes:
+            notes.write("my notes")
+        try:
+            EventJournal(not_journal)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("EventJournal opened a file that is not a journal")
+        with open(not_journal) as notes:
+            assert notes.read() == "my notes"
+
+    print("--- Journal throughput (10k events) ---")
+    for label, threshold_bytes, interval in (("fsync per event", 0, 0.0), ("group commit", 1 << 16, 0.05)):
+        rate, num_commits = measure_journal(10_000, threshold_bytes, interval)
+        print(f"{label:>16}: {rate:12,.0f} events/s, {num_commits} commits")
@@ -22,14 +22,21 @@ This file is Copyright (c) 2025 CSC111 Teaching Team
 """
 
 from __future__ import annotations
+from array import array
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterator, Optional, TYPE_CHECKING
+
+from proj1_output import OutputSink
+
+if TYPE_CHECKING:
+    from proj1_event_journal import EventJournal
 
 
 # TODO: Copy/paste your ex1_event_logger code below, and modify it if needed to fit your game
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """
     A node representing one event in an adventure game.
@@ -74,6 +81,7 @@ class EventList:
         - steps_taken: Total number of steps taken by the player.
         - completed_puzzles: List of completed puzzles.
         - completed_missions: List of completed NPC missions.
+        - journal: The journal every add_event and remove_last_event call is recorded in, or None.
 
     Representation Invariants:
         - If the list is not empty, the last event's next attribute has to be None.
@@ -83,20 +91,27 @@ class EventList:
     steps_taken: int
     completed_puzzles: list[str]
     completed_missions: list[str]
-
-    def __init__(self) -> None:
-        """Initialize a new empty event list."""
+    journal: Optional[EventJournal]
+    # Private Instance Attributes:
+    #   - _length: the number of events in the list.
+    _length: int
+
+    def __init__(self, journal: Optional[EventJournal] = None) -> None:
+        """Initialize a new empty event list, recording its changes in the given journal (if any)."""
+        self._length = 0
         self.first = None
         self.last = None
         self.steps_taken = 0
         self.completed_puzzles = []
         self.completed_missions = []
         self.prev_location = None
+        self.journal = journal
 
-    def display_events(self) -> None:
-        """Display all events in chronological order."""
-        curr = self.first
-        while curr:
+    def display_events(self, output: Optional[OutputSink] = None) -> None:
+        """Display all events in chronological order, writing them to the given sink
+        (or printing them, if no sink is given)."""
+        write = output.write if output is not None else print
+        for curr in self:
             event_info = f"Location: {curr.id_num}, Command: {curr.next_command}, Type: {curr.event_type}"
             if curr.affected_item:
                 event_info += f", Item: {curr.affected_item}"
@@ -104,9 +119,19 @@ class EventList:
                 event_info += f", Puzzle Completed: {curr.puzzle_completed}"
             if curr.mission_completed:
                 event_info += f", Mission Completed: {curr.mission_completed}"
-            print(event_info)
+            write(event_info)
+
+    def __iter__(self) -> Iterator[Event]:
+        """Return an iterator over the events in this list, in chronological order."""
+        curr = self.first
+        while curr is not None:
+            yield curr
             curr = curr.next
 
+    def __len__(self) -> int:
+        """Return the number of events in this list."""
+        return self._length
+
     def is_empty(self) -> bool:
         """Return whether this event list is empty."""
 
@@ -127,6 +152,7 @@ class EventList:
             self.last.next_command = command
             event.prev_location = self.last.id_num
             self.last = event
+        self._length += 1
 
         if event.event_type == "move":
             self.steps_taken += 1
@@ -139,6 +165,9 @@ class EventList:
         if event.mission_completed:
             self.completed_missions.append(event.mission_completed)
 
+        if self.journal is not None:
+            self.journal.record_add(event, command)
+
     def remove_last_event(self) -> None:
         """Remove the last event from this event list.
         If the list is empty, do nothing."""
@@ -147,7 +176,9 @@ class EventList:
                 # If only one event exists, reset the event list
                 self.first = None
                 self.last = None
+                self._length = 0
             else:
+                self._length -= 1
                 prev_event = self.last.prev
 
                 if self.last.event_type == "move":
@@ -164,6 +195,9 @@ class EventList:
                     self.last.next = None
                     self.last.next_command = None
 
+            if self.journal is not None:
+                self.journal.record_remove()
+
     def get_id_log(self) -> list[int]:
         """Return a list of all location IDs visited for each event in this list, in sequence."""
 
@@ -193,6 +227,221 @@ class EventList:
         return None
 
 
+class IdLog(Sequence):
+    """A read-only view of the location ids recorded in an ArrayEventList.
+
+    The view reflects later changes to the event list. It compares equal to any list or tuple
+    holding the same ids.
+    """
+    # Private Instance Attributes:
+    #   - _ids: the array of location ids this is a view of.
+    _ids: array
+
+    def __init__(self, ids: array) -> None:
+        self._ids = ids
+
+    def __getitem__(self, index: int | slice) -> int | list[int]:
+        """Return the id at the given index, or a list of the ids in the given slice."""
+        if isinstance(index, slice):
+            return self._ids[index].tolist()
+        return self._ids[index]
+
+    def __len__(self) -> int:
+        """Return the number of ids."""
+        return len(self._ids)
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether other is a sequence of the same ids."""
+        if isinstance(other, IdLog):
+            return self._ids == other._ids
+        if isinstance(other, (list, tuple)):
+            return len(other) == len(self._ids) and all(a == b for a, b in zip(self._ids, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """Return the ids formatted like a list."""
+        return repr(self._ids.tolist())
+
+
+class ArrayEventList(EventList):
+    """An event list with the same interface as EventList that stores each event field in a
+    contiguous array instead of linking Event nodes together.
+
+    Adding an event, removing the last event and reading the last event take constant time, and
+    get_id_log returns a view of the stored ids instead of building a new list. first, last and
+    the events produced by iteration are Event objects built from the arrays on demand; their
+    next and prev attributes are always None, and changing them does not change the list.
+
+    Instance Attributes:
+        - steps_taken: Total number of steps taken by the player.
+        - completed_puzzles: List of completed puzzles.
+        - completed_missions: List of completed NPC missions.
+        - journal: The journal every add_event and remove_last_event call is recorded in, or None.
+
+    Representation Invariants:
+        - len(self._ids) == len(self._prev_locations) == len(self._next_commands)
+        - len(self._ids) == len(self._event_types) == len(self._descriptions)
+    """
+    # Private Instance Attributes:
+    #   - _ids: the location id of each event.
+    #   - _prev_locations: the previous location id of each event, or NO_ID.
+    #   - _next_commands: the index into _strings of each event's next command, or NO_ID.
+    #   - _event_types: the index into _strings of each event's type, or NO_ID.
+    #   - _descriptions: the description of each event.
+    #   - _details: a mapping from event index to that event's affected item, completed puzzle
+    #     and completed mission, for the events that have any of them.
+    #   - _strings: every distinct command and event type, in the order first seen.
+    #   - _string_ids: a mapping from each string in _strings to its index.
+    _ids: array
+    _prev_locations: array
+    _next_commands: array
+    _event_types: array
+    _descriptions: list[str]
+    _details: dict[int, tuple[Optional[str], Optional[str], Optional[str]]]
+    _strings: list[str]
+    _string_ids: dict[str, int]
+
+    NO_ID = -1
+
+    def __init__(self, journal: Optional[EventJournal] = None) -> None:
+        """Initialize a new empty event list, recording its changes in the given journal (if any)."""
+        # EventList.__init__ is not called: first and last are computed from the arrays here
+        self.steps_taken = 0
+        self.completed_puzzles = []
+        self.completed_missions = []
+        self.prev_location = None
+        self.journal = journal
+        self._ids = array('q')
+        self._prev_locations = array('q')
+        self._next_commands = array('l')
+        self._event_types = array('l')
+        self._descriptions = []
+        self._details = {}
+        self._strings = []
+        self._string_ids = {}
+
+    @property
+    def first(self) -> Optional[Event]:
+        """Return the first event in the list, or None if the list is empty."""
+        return self._event_at(0) if self._ids else None
+
+    @property
+    def last(self) -> Optional[Event]:
+        """Return the last event in the list, or None if the list is empty."""
+        return self._event_at(len(self._ids) - 1) if self._ids else None
+
+    def __iter__(self) -> Iterator[Event]:
+        """Return an iterator over the events in this list, in chronological order."""
+        return (self._event_at(index) for index in range(len(self._ids)))
+
+    def __len__(self) -> int:
+        """Return the number of events in this list."""
+        return len(self._ids)
+
+    def is_empty(self) -> bool:
+        """Return whether this event list is empty."""
+        return not self._ids
+
+    def add_event(self, event: Event, command: str = None) -> None:
+        """Add the given new event to the end of this event list.
+        The given command is the command which was used to reach this new event, or None if this is the first
+        event in the game.
+        """
+        if self._ids:
+            self._next_commands[-1] = self._string_id(command)
+            event.prev_location = self._ids[-1]
+        else:
+            event.prev_location = event.id_num
+
+        index = len(self._ids)
+        self._ids.append(event.id_num)
+        self._prev_locations.append(self.NO_ID if event.prev_location is None else event.prev_location)
+        self._next_commands.append(self._string_id(event.next_command))
+        self._event_types.append(self._string_id(event.event_type))
+        self._descriptions.append(event.description)
+        if event.affected_item or event.puzzle_completed or event.mission_completed:
+            self._details[index] = (event.affected_item, event.puzzle_completed, event.mission_completed)
+
+        if event.event_type == "move":
+            self.steps_taken += 1
+
+        if event.puzzle_completed:
+            self.completed_puzzles.append(event.puzzle_completed)
+
+        if event.mission_completed:
+            self.completed_missions.append(event.mission_completed)
+
+        if self.journal is not None:
+            self.journal.record_add(event, command)
+
+    def remove_last_event(self) -> None:
+        """Remove the last event from this event list.
+        If the list is empty, do nothing."""
+        if not self._ids:
+            return
+
+        index = len(self._ids) - 1
+        details = self._details.pop(index, None)
+        if index > 0:
+            # As in EventList, removing the only event does not roll back the counters
+            if self._strings_at(self._event_types, index) == "move":
+                self.steps_taken = max(0, self.steps_taken - 1)
+            if details is not None:
+                _, puzzle_completed, mission_completed = details
+                if puzzle_completed:
+                    self.completed_puzzles.remove(puzzle_completed)
+                if mission_completed:
+                    self.completed_missions.remove(mission_completed)
+
+        for column in (self._ids, self._prev_locations, self._next_commands, self._event_types, self._descriptions):
+            column.pop()
+        if self._ids:
+            self._next_commands[-1] = self.NO_ID
+
+        if self.journal is not None:
+            self.journal.record_remove()
+
+    def get_id_log(self) -> IdLog:
+        """Return a read-only view of all location IDs visited for each event in this list, in sequence."""
+        return IdLog(self._ids)
+
+    def get_previous_location(self) -> Optional[int]:
+        """Return the player's previous location before the last recorded event, or None if there is none."""
+        if len(self._ids) > 1:
+            return self._ids[-2]
+        return None
+
+    def _event_at(self, index: int) -> Event:
+        """Return a new Event holding the fields of the event at the given index."""
+        affected_item, puzzle_completed, mission_completed = self._details.get(index, (None, None, None))
+        prev_location = self._prev_locations[index]
+        return Event(
+            id_num=self._ids[index],
+            description=self._descriptions[index],
+            prev_location=None if prev_location == self.NO_ID else prev_location,
+            next_command=self._strings_at(self._next_commands, index),
+            event_type=self._strings_at(self._event_types, index),
+            affected_item=affected_item,
+            puzzle_completed=puzzle_completed,
+            mission_completed=mission_completed
+        )
+
+    def _string_id(self, string: Optional[str]) -> int:
+        """Return the index of the given string in _strings (adding it if needed), or NO_ID for None."""
+        if string is None:
+            return self.NO_ID
+        string_id = self._string_ids.get(string)
+        if string_id is None:
+            string_id = self._string_ids[string] = len(self._strings)
+            self._strings.append(string)
+        return string_id
+
+    def _strings_at(self, column: array, index: int) -> Optional[str]:
+        """Return the string whose index is stored at the given index of the given column, or None."""
+        string_id = column[index]
+        return None if string_id == self.NO_ID else self._strings[string_id]
+
+
 if __name__ == "__main__":
     pass
     # When you are ready to check your work with python_ta, uncomment the following lines.
@@ -0,0 +1,169 @@
+"""CSC111 Project 1: Text Adventure Game - Server Load Test
+
+Module Description
+==================
+
+This module measures how many concurrent sessions one GameServer process can serve. It starts
+the server in a child process, opens many client sessions at once, and has each play the same
+walkthrough, waiting for each response before sending the next command. It reports the
+commands served per second, the latency of each command as seen by the client, the CPU
+time the server used per command, and the number of sessions one core can serve.
+
+The server is a single asyncio process, so everything it serves is served by one core. The
+sessions in the test send commands as fast as they can; a real player pauses between commands,
+so the sessions per core are those that send one command every PLAYER_COMMAND_INTERVAL seconds.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import asyncio
+import multiprocessing
+import os
+import resource
+import signal
+import time
+from dataclasses import dataclass
+
+from proj1_server import PROMPT, serve
+
+WALKTHROUGH = ["go east", "pick up coffee", "go west", "go north", "pick up notebook", "look", "go south",
+               "go south", "buy Dry Noodles", "inventory", "drop notebook", "undo", "go north", "score"]
+
+# The seconds between a typical player's commands
+PLAYER_COMMAND_INTERVAL = 5.0
+
+_PROMPT_LINE = (PROMPT + "\n").encode('utf-8')
+
+
+@dataclass
+class LoadTestResult:
+    """The results of one load test.
+
+    Instance Attributes:
+        - sessions: The number of sessions played at once.
+        - commands: The number of commands sent across all sessions.
+        - seconds: The wall-clock time from the first connection to the last response.
+        - latencies: The seconds from sending each command to receiving its whole response, sorted.
+
+    Representation Invariants:
+        - len(self.latencies) == self.commands
+    """
+    sessions: int
+    commands: int
+    seconds: float
+    latencies: list[float]
+
+    def percentile(self, p: float) -> float:
+        """Return the p-th percentile command latency, in seconds."""
+        return self.latencies[min(len(self.latencies) - 1, int(len(self.latencies) * p / 100))]
+
+    def commands_per_second(self) -> float:
+        """Return the number of commands served per second."""
+        return self.commands / self.seconds
+
+
+async def _read_response(reader: asyncio.StreamReader) -> None:
+    """Read one response, up to and including its prompt line."""
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("The server closed the session")
+        if line == _PROMPT_LINE:
+            return
+
+
+async def _play_session(host: str, port: int, commands: list[str], connect_limit: asyncio.Semaphore,
+                        latencies: list[float]) -> None:
+    """Play one session with the given commands, adding each command's latency to latencies."""
+    async with connect_limit:
+        reader, writer = await asyncio.open_connection(host, port)
+        await _read_response(reader)
+    try:
+        for command in commands:
+            start = time.perf_counter()
+            writer.write((command + "\n").encode('utf-8'))
+            await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load_test(host: str, port: int, num_sessions: int, commands: list[str]) -> LoadTestResult:
+    """Play num_sessions sessions at once against the server at the given address, each sending the
+    given commands, and return the results."""
+    latencies = []
+    # Connecting is throttled so the server's listen backlog never overflows
+    connect_limit = asyncio.Semaphore(256)
+    start = time.perf_counter()
+    await asyncio.gather(*(_play_session(host, port, commands, connect_limit, latencies)
+                           for _ in range(num_sessions)))
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    return LoadTestResult(num_sessions, len(latencies), seconds, latencies)
+
+
+def _run_server(game_data_file: str, port: int) -> None:
+    """Serve the given game data file on the given port until SIGTERM is received."""
+    asyncio.run(serve(game_data_file, port=port, max_sessions=100_000))
+
+
+def _wait_for_server(port: int, timeout: float = 10.0) -> None:
+    """Wait until a server accepts connections on the given local port."""
+    async def connect() -> None:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.05)
+            else:
+                writer.close()
+                await writer.wait_closed()
+                return
+    asyncio.run(connect())
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+
+    test_port = 8112
+    server_process = multiprocessing.Process(target=_run_server, args=('game_data.json', test_port))
+    server_process.start()
+    try:
+        _wait_for_server(test_port)
+        results = [asyncio.run(run_load_test("127.0.0.1", test_port, n, WALKTHROUGH)) for n in (100, 1000, 3000)]
+    finally:
+        os.kill(server_process.pid, signal.SIGTERM)
+        server_process.join()
+    server_cpu = resource.getrusage(resource.RUSAGE_CHILDREN)
+    total_commands = sum(result.commands for result in results)
+
+    print(f"--- Load test ({os.cpu_count()} CPU(s); client and server share them) ---")
+    for result in results:
+        print(f"{result.sessions:>5} sessions: {result.commands_per_second():9,.0f} commands/s, "
+              f"latency p50 {result.percentile(50) * 1000:7.2f} ms, p99 {result.percentile(99) * 1000:7.2f} ms")
+    cpu_per_command = (server_cpu.ru_utime + server_cpu.ru_stime) / total_commands
+    print(f"Server CPU per command: {cpu_per_command * 1e6:.0f} us "
+          f"({1 / cpu_per_command:,.0f} commands per server core-second)")
+    print(f"Sessions per core: {PLAYER_COMMAND_INTERVAL / cpu_per_command:,.0f} sessions sending one command "
+          f"every {PLAYER_COMMAND_INTERVAL:g} s (up to {max(result.sessions for result in results):,} were "
+          f"open at once here)")
@@ -0,0 +1,116 @@
+"""CSC111 Project 1: Text Adventure Game - Output Sinks
+
+Module Description
+==================
+
+This module contains the output sinks that all player-facing game text is written to.
+AdventureGame and AdventureGameSimulation write each line to a sink, and flush the sink once
+per command, so the sink decides how (and whether) text actually reaches the player.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import sys
+from typing import Optional, TextIO
+
+
+class OutputSink:
+    """An abstract destination for player-facing game text.
+
+    This is an abstract class. Only subclasses should be instantiated.
+    """
+
+    def write(self, line: str) -> None:
+        """Write the given line of game text."""
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Deliver any game text written since the last flush."""
+        return None
+
+
+class BufferedStdoutSink(OutputSink):
+    """A sink that buffers game text and writes it to a stream (standard output by default)
+    in a single call on each flush.
+
+    Instance Attributes:
+        - stream: The stream flushed text is written to, or None to use sys.stdout at flush time.
+    """
+    stream: Optional[TextIO]
+    # Private Instance Attributes:
+    #   - _lines: the lines written since the last flush.
+    _lines: list[str]
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        """Initialize a sink writing to the given stream."""
+        self.stream = stream
+        self._lines = []
+
+    def write(self, line: str) -> None:
+        """Buffer the given line of game text."""
+        self._lines.append(line)
+
+    def flush(self) -> None:
+        """Write every buffered line to the stream at once."""
+        if self._lines:
+            stream = self.stream if self.stream is not None else sys.stdout
+            self._lines.append('')
+            stream.write('\n'.join(self._lines))
+            stream.flush()
+            self._lines = []
+
+
+class CollectorSink(OutputSink):
+    """A sink that keeps all game text in memory.
+
+    Instance Attributes:
+        - lines: Every line written to this sink, in order.
+    """
+    lines: list[str]
+
+    def __init__(self) -> None:
+        """Initialize an empty collector."""
+        self.lines = []
+
+    def write(self, line: str) -> None:
+        """Keep the given line of game text."""
+        self.lines.append(line)
+
+    def getvalue(self) -> str:
+        """Return all the text written to this sink, one line per written line."""
+        return ''.join(line + '\n' for line in self.lines)
+
+    def drain(self) -> str:
+        """Return all the text written to this sink, as getvalue does, and then forget it."""
+        text = self.getvalue()
+        self.lines = []
+        return text
+
+
+class NullSink(OutputSink):
+    """A sink that discards all game text."""
+
+    def write(self, line: str) -> None:
+        """Discard the given line of game text."""
+        return None
+
+
+if __name__ == "__main__":
+    pass
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
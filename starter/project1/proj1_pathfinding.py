@@ -0,0 +1,226 @@
+"""CSC111 Project 1: Text Adventure Game - Pathfinding
+
+Module Description
+==================
+
+This module contains PathFinder, which answers "which exit should I take to get from A to B by
+the fewest moves?" over the graph formed by the exits of a world's locations. AdventureGame
+only runs an exit through its "go" verb, so only exits whose case-folded command starts with
+MOVE_PREFIX are part of the graph; a route never names an exit the player cannot take.
+
+For each goal location it is asked about, PathFinder runs one breadth-first search backwards
+along the exits, from the goal outwards. The result is a tree that holds, for every location
+that can reach the goal, the exit to take next and the number of moves left. The tree is cached,
+so later questions about the same goal take constant time. A route is found by following the
+tree's exits.
+
+Asked for the nearest of several goals, PathFinder runs one search from all of them at once, and
+caches the resulting tree under the set of goals, so the question costs one search however many
+goals there are.
+
+Games never change exits, but tools that edit a world can report their changes with
+exit_added and exit_removed. Only the cached trees the change affects are dropped.
+
+One PathFinder may be shared by games running in different threads. Pickling a PathFinder
+keeps its settings and its locations (which a pickled World shares with it), but not its graph or
+trees; they are rebuilt when they are next needed.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import threading
+from collections import deque
+from collections.abc import Iterable, Mapping
+from typing import Optional
+
+from game_entities import Location
+
+# The start of every exit command that AdventureGame runs as a move
+MOVE_PREFIX = "go "
+
+# A route tree maps each location that can reach one of its goals to (the exit to take, the moves
+# left, the id of the goal reached); each goal maps to (None, 0, its id)
+RouteTree = dict[int, tuple[Optional[str], int, int]]
+
+
+class PathFinder:
+    """Shortest routes over the exits of a mapping of locations, found with cached reverse BFS trees.
+
+    Instance Attributes:
+        - max_trees: The most route trees kept; the least recently used tree is dropped first.
+        - searches: The number of breadth-first searches run so far.
+
+    Representation Invariants:
+        - self.max_trees > 0
+        - len(self._trees) <= self.max_trees
+    """
+    max_trees: int
+    searches: int
+    # Private Instance Attributes:
+    #   - _locations: the locations whose exits form the graph.
+    #   - _entrances: a mapping from each location id to the (source id, exit) pairs leading into it,
+    #     or None until the first search.
+    #   - _trees: a mapping from goal id, or frozenset of several goal ids, to its route tree, least
+    #     recently used first.
+    #   - _lock: held while _entrances or _trees is read or changed.
+    _locations: Mapping[int, Location]
+    _entrances: Optional[dict[int, list[tuple[int, str]]]]
+    _trees: dict[int | frozenset[int], RouteTree]
+    _lock: threading.Lock
+
+    def __init__(self, locations: Mapping[int, Location], max_trees: int = 256) -> None:
+        """Initialize a path finder over the exits of the given locations. The graph is not read
+        until the first question is asked."""
+        self.max_trees = max_trees
+        self.searches = 0
+        self._locations = locations
+        self._entrances = None
+        self._trees = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, object]:
+        """Return the state to pickle: the settings and locations, without the lock or any cache."""
+        return {'max_trees': self.max_trees, 'locations': self._locations}
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        """Restore a PathFinder pickled with __getstate__."""
+        self.__init__(state['locations'], state['max_trees'])
+
+    def route_tree(self, goal_id: int) -> RouteTree:
+        """Return the route tree towards the location with the given id, searching for it only if it
+        is not cached."""
+        return self._cached_tree(goal_id, [goal_id])
+
+    def next_exit(self, location_id: int, goal_id: int) -> Optional[str]:
+        """Return the exit to take from location_id on a shortest route to goal_id, or None if the
+        player is already there or the goal cannot be reached."""
+        step = self.route_tree(goal_id).get(location_id)
+        return None if step is None else step[0]
+
+    def distance(self, location_id: int, goal_id: int) -> Optional[int]:
+        """Return the fewest moves from location_id to goal_id, or None if the goal cannot be reached."""
+        step = self.route_tree(goal_id).get(location_id)
+        return None if step is None else step[1]
+
+    def shortest_route(self, start_id: int, goal_id: int) -> Optional[list[str]]:
+        """Return the exits to take, in order, on a shortest route from start_id to goal_id, or None if
+        the goal cannot be reached."""
+        tree = self.route_tree(goal_id)
+        if start_id not in tree:
+            return None
+        route = []
+        current = start_id
+        while current != goal_id:
+            command = tree[current][0]
+            route.append(command)
+            current = self._locations[current].exits.get(command)
+        return route
+
+    def nearest(self, location_id: int, goal_ids: Iterable[int]) -> Optional[tuple[int, Optional[str], int]]:
+        """Return (goal id, exit to take, moves left) for the goal in goal_ids nearest to location_id,
+        or None if none of them can be reached. Ties go to the goal with the smallest id."""
+        goals = frozenset(goal_ids)
+        if not goals:
+            return None
+        if len(goals) == 1:
+            tree = self.route_tree(next(iter(goals)))
+        else:
+            tree = self._cached_tree(goals, sorted(goals))
+        step = tree.get(location_id)
+        return None if step is None else (step[2], step[0], step[1])
+
+    def exit_added(self, source_id: int, command: str, target_id: int) -> None:
+        """Record that the exit command (case-folded) from source_id to target_id has been added to
+        the locations, dropping the cached trees it shortens a route in."""
+        if not command.startswith(MOVE_PREFIX):
+            return
+        with self._lock:
+            if self._entrances is not None:
+                self._entrances.setdefault(target_id, []).append((source_id, command))
+            for goal_id, tree in list(self._trees.items()):
+                target_step = tree.get(target_id)
+                source_step = tree.get(source_id)
+                if target_step is not None and (source_step is None or target_step[1] + 1 < source_step[1]):
+                    del self._trees[goal_id]
+
+    def exit_removed(self, source_id: int, command: str, target_id: int) -> None:
+        """Record that the exit command (case-folded) from source_id to target_id has been removed
+        from the locations, dropping the cached trees that route through it."""
+        if not command.startswith(MOVE_PREFIX):
+            return
+        with self._lock:
+            if self._entrances is not None:
+                self._entrances[target_id].remove((source_id, command))
+            for goal_id, tree in list(self._trees.items()):
+                source_step = tree.get(source_id)
+                if source_step is not None and source_step[0] == command:
+                    del self._trees[goal_id]
+
+    def _cached_tree(self, key: int | frozenset[int], goal_ids: list[int]) -> RouteTree:
+        """Return the route tree cached under key, towards the given goals, searching for it only if it
+        is not cached."""
+        with self._lock:
+            tree = self._trees.pop(key, None)
+            if tree is None:
+                tree = self._search(goal_ids)
+                if len(self._trees) >= self.max_trees:
+                    del self._trees[next(iter(self._trees))]
+            self._trees[key] = tree
+        return tree
+
+    def _search(self, goal_ids: list[int]) -> RouteTree:
+        """Return the route tree towards the nearest of goal_ids, found by one breadth-first search
+        along entrances. A location as near to two goals is routed to the one listed first."""
+        if self._entrances is None:
+            self._entrances = self._collect_entrances()
+        self.searches += 1
+        tree = {goal_id: (None, 0, goal_id) for goal_id in goal_ids}
+        queue = deque(tree)
+        while queue:
+            current = queue.popleft()
+            _, moves, goal_id = tree[current]
+            for source_id, command in self._entrances.get(current, ()):
+                if source_id not in tree:
+                    tree[source_id] = (command, moves + 1, goal_id)
+                    queue.append(source_id)
+        return tree
+
+    def _collect_entrances(self) -> dict[int, list[tuple[int, str]]]:
+        """Return a mapping from each location id to the (source id, exit) pairs leading into it, for
+        the exits that are moves.
+
+        Locations with an iter_exits method (LazyLocations and ArrayLocations) are asked for their
+        exits with it, so no Location or LocationView is built.
+        """
+        iter_exits = getattr(self._locations, 'iter_exits', None)
+        if iter_exits is not None:
+            exits = iter_exits()
+        else:
+            exits = ((location_id, command, target_id) for location_id in list(self._locations)
+                     for command, target_id in self._locations[location_id].exits.items())
+        entrances = {}
+        for location_id, command, target_id in exits:
+            if command.startswith(MOVE_PREFIX):
+                entrances.setdefault(target_id, []).append((location_id, command))
+        return entrances
+
+
+if __name__ == "__main__":
+    pass
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
@@ -0,0 +1,283 @@
+"""CSC111 Project 1: Text Adventure Game - Game Server
+
+Module Description
+==================
+
+This module contains GameServer, an asyncio TCP server that hosts many AdventureGame sessions
+in one process. The game data is loaded once when the server starts; each connection gets its
+own session, played on a World spawned from the loaded one (see World.spawn).
+
+The protocol is line based. The client sends one command per line (UTF-8). After the session's
+opening text, and after each command, the server sends the game's text followed by a line
+holding only PROMPT. The server closes the connection when the player quits, when the
+connection has been idle for idle_timeout seconds, or when the server shuts down.
+
+A command that takes longer than command_timeout seconds cannot be stopped, since it runs in a
+thread. Its session is told so and stays busy until the command finishes: commands sent in the
+meantime are rejected, and the game's text is not read. The command's text is sent with the
+response to the first command after it finishes. A session that ends while it is busy keeps its
+place in sessions until its command finishes.
+
+Run this module to serve game_data.json on DEFAULT_PORT until interrupted.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from adventure import AdventureGame, normalize_input
+from proj1_event_logger import EventList
+from proj1_output import CollectorSink
+from proj1_world_cache import load_cached_world
+from proj1_world_loader import World
+
+DEFAULT_PORT = 8111
+PROMPT = ">"
+
+_server_log = logging.getLogger("adventure.server")
+
+
+class GameServer:
+    """A TCP server hosting one AdventureGame session per connection, all played on one loaded world.
+
+    Instance Attributes:
+        - game_data_file: The name of the game data file the sessions are played on.
+        - initial_location_id: The id of the location every session starts at.
+        - command_timeout: The most seconds one command may take before its session is ended, or None
+          to run commands directly on the event loop, with no timeout.
+        - idle_timeout: The most seconds a session may wait for a command, or None for no limit.
+        - max_sessions: The most sessions that may be open at once; further connections are refused.
+        - world: The world loaded from the game data file, which every session's world is spawned from,
+          or None until the server is started.
+        - sessions: A mapping from session id to the game of each open session, including ended
+          sessions whose timed-out command is still running.
+
+    Representation Invariants:
+        - self.max_sessions > 0
+        - len(self.sessions) <= self.max_sessions
+    """
+    game_data_file: str
+    initial_location_id: int
+    command_timeout: Optional[float]
+    idle_timeout: Optional[float]
+    max_sessions: int
+    world: Optional[World]
+    sessions: dict[int, AdventureGame]
+    # Private Instance Attributes:
+    #   - _world_loader: the function the world is loaded with.
+    #   - _server: the listening asyncio server, or None if the server is not started.
+    #   - _executor: the threads commands run in when command_timeout is not None.
+    #   - _connections: the tasks handling the open connections.
+    #   - _running: a mapping from session id to the timed-out command the session is busy with.
+    #   - _waiting: the connection tasks currently waiting for a command.
+    #   - _closing: whether the server is shutting down.
+    #   - _next_session_id: the id the next session will get.
+    _world_loader: Callable[[str], World]
+    _server: Optional[asyncio.Server]
+    _executor: Optional[ThreadPoolExecutor]
+    _connections: set[asyncio.Task]
+    _running: dict[int, asyncio.Future]
+    _waiting: set[asyncio.Task]
+    _closing: bool
+    _next_session_id: int
+
+    def __init__(self, game_data_file: str, initial_location_id: int = 1, command_timeout: Optional[float] = 2.0,
+                 idle_timeout: Optional[float] = 600.0, max_sessions: int = 10_000,
+                 world_loader: Callable[[str], World] = load_cached_world) -> None:
+        """Initialize a server for the given game data file. The world is loaded when it is started."""
+        self.game_data_file = game_data_file
+        self.initial_location_id = initial_location_id
+        self.command_timeout = command_timeout
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.world = None
+        self.sessions = {}
+        self._world_loader = world_loader
+        self._server = None
+        self._executor = None
+        self._connections = set()
+        self._running = {}
+        self._waiting = set()
+        self._closing = False
+        self._next_session_id = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> int:
+        """Load the world and start accepting connections on the given host and port (0 picks a free
+        port). Return the port the server listens on."""
+        self.world = self._world_loader(self.game_data_file)
+        if self.command_timeout is not None:
+            self._executor = ThreadPoolExecutor(thread_name_prefix="adventure-command")
+        self._server = await asyncio.start_server(self._handle_connection, host, port, backlog=1024)
+        port = self._server.sockets[0].getsockname()[1]
+        _server_log.info("Serving %s on %s:%s", self.game_data_file, host, port)
+        return port
+
+    async def shutdown(self, grace_period: float = 5.0) -> None:
+        """Stop accepting connections and end every session. Sessions waiting for a command are
+        told the server is shutting down; commands being run are given grace_period seconds to finish.
+        """
+        self._closing = True
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in list(self._waiting):
+            task.cancel()
+        if self._connections:
+            _, pending = await asyncio.wait(self._connections, timeout=grace_period)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        _server_log.info("Server shut down")
+
+    def new_session(self) -> AdventureGame:
+        """Return a new game played on a world spawned from the loaded world, writing its text to a
+        CollectorSink."""
+        return AdventureGame(self.game_data_file, self.initial_location_id, EventList(),
+                             world_loader=lambda _: self.world.spawn(), output=CollectorSink())
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Play one session with the client on the given connection."""
+        task = asyncio.current_task()
+        if self._closing or len(self.sessions) >= self.max_sessions:
+            await _send(writer, "The server is full. Please try again later.\n")
+            await _close(writer)
+            return
+
+        self._connections.add(task)
+        session_id = self._next_session_id
+        self._next_session_id += 1
+        game = self.new_session()
+        self.sessions[session_id] = game
+        sink = game.output
+        response = sink.drain()
+        try:
+            while game.ongoing and await _send(writer, response + PROMPT + "\n"):
+                line = await self._read_command(reader, task)
+                if line is None:
+                    response = ("The server is shutting down.\n" if self._closing
+                                else "Disconnected for inactivity.\n")
+                    break
+                if not line:
+                    response = ""
+                    break
+                if session_id in self._running:
+                    response = "Your last command is still running. Please wait for it to finish.\n"
+                elif await self._run_command(session_id, game, normalize_input(line.decode('utf-8', 'replace'))):
+                    response = sink.drain()
+                else:
+                    response = "That command is taking a long time. Its result will be shown after it finishes.\n"
+            else:
+                response = ""
+            if session_id not in self._running:
+                response = sink.drain() + response
+            await _send(writer, response)
+        finally:
+            if session_id in self._running:
+                # Runs after _command_finished, which was added first
+                self._running[session_id].add_done_callback(lambda _: self.sessions.pop(session_id))
+            else:
+                del self.sessions[session_id]
+            self._connections.discard(task)
+            await _close(writer)
+
+    async def _read_command(self, reader: asyncio.StreamReader, task: asyncio.Task) -> Optional[bytes]:
+        """Return the next line sent on the connection (b"" if it was closed), or None if the session
+        was idle for too long or the server is shutting down."""
+        self._waiting.add(task)
+        try:
+            return await asyncio.wait_for(reader.readline(), self.idle_timeout)
+        except asyncio.TimeoutError:
+            return None
+        except asyncio.CancelledError:
+            if self._closing:
+                return None
+            raise
+        except ConnectionError:
+            return b""
+        finally:
+            self._waiting.discard(task)
+
+    async def _run_command(self, session_id: int, game: AdventureGame, command: str) -> bool:
+        """Run the given command in the given session's game. Return False if it did not finish in
+        time, in which case the session is busy until it does."""
+        if self._executor is None:
+            game.handle_command(command)
+            return True
+        future = asyncio.get_running_loop().run_in_executor(self._executor, game.handle_command, command)
+        try:
+            # Cancelling the future would not stop its thread, only hide that it is still running
+            await asyncio.wait_for(asyncio.shield(future), self.command_timeout)
+        except asyncio.TimeoutError:
+            _server_log.warning("Command %r timed out", command)
+            self._running[session_id] = future
+            future.add_done_callback(lambda _: self._command_finished(session_id, command, future))
+            return False
+        return True
+
+    def _command_finished(self, session_id: int, command: str, future: asyncio.Future) -> None:
+        """Mark the given session as no longer busy with the given timed-out command, which has
+        finished."""
+        del self._running[session_id]
+        if not future.cancelled() and future.exception() is not None:
+            _server_log.error("Timed-out command %r failed", command, exc_info=future.exception())
+
+
+async def _send(writer: asyncio.StreamWriter, text: str) -> bool:
+    """Send the given text on the given connection. Return False if the connection is closed."""
+    try:
+        writer.write(text.encode('utf-8'))
+        await writer.drain()
+    except ConnectionError:
+        return False
+    return True
+
+
+async def _close(writer: asyncio.StreamWriter) -> None:
+    """Close the given connection, ignoring errors from a client that is already gone."""
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except ConnectionError:
+        pass
+
+
+async def serve(game_data_file: str, host: str = "127.0.0.1", port: int = DEFAULT_PORT, **options: object) -> None:
+    """Serve the given game data file until SIGINT or SIGTERM is received, then shut down gracefully.
+    The options are passed to GameServer."""
+    server = GameServer(game_data_file, **options)
+    await server.start(host, port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    await stop.wait()
+    await server.shutdown()
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+
+    logging.basicConfig(format="%(name)s: %(levelname)s: %(message)s", level=logging.INFO)
+    asyncio.run(serve('game_data.json'))
@@ -0,0 +1,299 @@
+"""CSC111 Project 1: Text Adventure Game - Saved Sessions
+
+Module Description
+==================
+
+This module saves a running AdventureGame to a file and restores it later, possibly in another
+process. A save holds only the state that differs from the world as loaded from the game data
+file; the world itself is restored from its compiled world file (see proj1_world_cache), so
+restoring a session never reads the game data file while that file is up to date.
+
+A save file is little-endian binary:
+    - SESSION_MAGIC, the format version (2 bytes), the SHA-256 digest of the game data the
+      world was built from (32 bytes) and the name of the game data file
+    - the player's location, coins and score, the game's move count and whether it is ongoing
+    - the indexes (into the world's item list) of the items the player carries, in order
+    - each item whose placement differs from its start position, with its location (or NOWHERE)
+    - the ids of the visited locations
+    - the event log: a table of its distinct strings, then each event's location id and the
+      string table indexes (or NO_STRING) of its fields in EVENT_FIELDS
+
+Strings are length-prefixed UTF-8; counts and lengths are 4-byte unsigned ints, and ids and
+amounts 8-byte signed ints. The undo history is not saved.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import os
+import struct
+from typing import Optional
+
+from adventure import AdventureGame
+from proj1_event_logger import Event, EventList
+from proj1_output import BufferedStdoutSink, NullSink, OutputSink
+from proj1_world_cache import hash_game_data, load_cached_world, load_compiled_world
+
+SESSION_MAGIC = b'CSC111SV'
+SESSION_FORMAT_VERSION = 1
+
+# The Event fields stored as string table indexes, in order
+EVENT_FIELDS = ('description', 'next_command', 'event_type', 'affected_item', 'puzzle_completed', 'mission_completed')
+NO_STRING = -1
+NOWHERE = -1
+
+_VERSION = struct.Struct('<H')
+_COUNT = struct.Struct('<I')
+_INT = struct.Struct('<q')
+_PLAYER = struct.Struct('<qqqq?')
+_PLACEMENT = struct.Struct('<Iq')
+_EVENT = struct.Struct('<q' + 'i' * len(EVENT_FIELDS))
+
+
+class _Writer:
+    """A buffer that a save file is built in."""
+    # Private Instance Attributes:
+    #   - _buf: the bytes written so far.
+    _buf: bytearray
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+
+    def pack(self, fmt: struct.Struct, *values: object) -> None:
+        """Append the given values, packed with the given format."""
+        self._buf += fmt.pack(*values)
+
+    def raw(self, data: bytes) -> None:
+        """Append the given bytes."""
+        self._buf += data
+
+    def string(self, string: str) -> None:
+        """Append the given string, prefixed with its length."""
+        data = string.encode('utf-8')
+        self._buf += _COUNT.pack(len(data))
+        self._buf += data
+
+    def getvalue(self) -> bytes:
+        """Return everything written so far."""
+        return bytes(self._buf)
+
+
+class _Reader:
+    """A cursor over the contents of a save file."""
+    # Private Instance Attributes:
+    #   - _data: the contents of the save file.
+    #   - _pos: the offset of the next unread byte.
+    _data: bytes
+    _pos: int
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._pos = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        """Read and return the values packed with the given format."""
+        if self._pos + fmt.size > len(self._data):
+            raise ValueError("Saved session is truncated")
+        values = fmt.unpack_from(self._data, self._pos)
+        self._pos += fmt.size
+        return values
+
+    def count(self) -> int:
+        """Read and return a count."""
+        return self.unpack(_COUNT)[0]
+
+    def raw(self, size: int) -> bytes:
+        """Read and return the given number of bytes."""
+        if self._pos + size > len(self._data):
+            raise ValueError("Saved session is truncated")
+        data = self._data[self._pos:self._pos + size]
+        self._pos += size
+        return data
+
+    def string(self) -> str:
+        """Read and return a length-prefixed string."""
+        return self.raw(self.count()).decode('utf-8')
+
+
+def save_session(game: AdventureGame, filename: str) -> None:
+    """Save the given game's session state to the file with the given name, replacing it atomically.
+
+    The save names the game data the game's world was loaded from. Only if the world loader did not
+    record its hash is the game data file hashed now.
+    """
+    source_hash = game.source_hash if game.source_hash is not None else hash_game_data(game.game_data_file)
+    writer = _Writer()
+    writer.raw(SESSION_MAGIC)
+    writer.pack(_VERSION, SESSION_FORMAT_VERSION)
+    writer.raw(bytes.fromhex(source_hash))
+    writer.string(game.game_data_file)
+
+    player = game.player
+    writer.pack(_PLAYER, player.current_location, player.coins, player.score, game.moves_made, game.ongoing)
+
+    items = game.get_items()
+    item_index = {id(item): index for index, item in enumerate(items)}
+    writer.pack(_COUNT, len(player.inventory))
+    for item in player.inventory:
+        writer.pack(_COUNT, item_index[id(item)])
+
+    moved = []
+    for index, item in enumerate(items):
+        location_id = game.get_item_location(item.name)
+        start = item.start_position if game.get_location(item.start_position, quiet=True) else None
+        if location_id != start:
+            moved.append((index, NOWHERE if location_id is None else location_id))
+    writer.pack(_COUNT, len(moved))
+    for index, location_id in moved:
+        writer.pack(_PLACEMENT, index, location_id)
+
+    visited = game.get_visited_locations()
+    writer.pack(_COUNT, len(visited))
+    for location_id in visited:
+        writer.pack(_INT, location_id)
+
+    _write_events(writer, game.game_log)
+
+    tmp_file = filename + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(writer.getvalue())
+    os.replace(tmp_file, filename)
+
+
+def load_session(filename: str, output: Optional[OutputSink] = None,
+                 events: Optional[EventList] = None) -> AdventureGame:
+    """Return the game saved in the file with the given name, writing its text to output and
+    recording its event log in the given empty event list (by default, a new EventList).
+
+    The world is read from the compiled world file of the saved game data file. Only if that is
+    missing or out of date is the game data file read (and the world compiled again), and a
+    ValueError is raised if the game data has changed since the session was saved.
+    """
+    with open(filename, 'rb') as f:
+        reader = _Reader(f.read())
+    if reader.raw(len(SESSION_MAGIC)) != SESSION_MAGIC:
+        raise ValueError(f"{filename} is not a saved session")
+    (version,) = reader.unpack(_VERSION)
+    if version != SESSION_FORMAT_VERSION:
+        raise ValueError(f"Saved session format version {version} is not supported")
+    source_hash = reader.raw(32).hex()
+    game_data_file = reader.string()
+
+    world = load_compiled_world(game_data_file, source_hash)
+    if world is None:
+        world = load_cached_world(game_data_file)
+        if world.source_hash != source_hash:
+            raise ValueError(f"{game_data_file} has changed since the session was saved")
+
+    location, coins, score, moves_made, ongoing = reader.unpack(_PLAYER)
+    # The restored game's arrival text is discarded; the player is already at this location
+    game = AdventureGame(game_data_file, location, EventList(), world_loader=lambda _: world, output=NullSink())
+    game.output = output if output is not None else BufferedStdoutSink()
+    game.player.coins, game.player.score = coins, score
+    game.moves_made, game.ongoing = moves_made, ongoing
+
+    items = game.get_items()
+    for _ in range(reader.count()):
+        game.player.add_item(items[reader.count()])
+    for _ in range(reader.count()):
+        index, location_id = reader.unpack(_PLACEMENT)
+        game.place_item(items[index].name, None if location_id == NOWHERE else location_id)
+
+    game.set_visited_locations(reader.unpack(_INT)[0] for _ in range(reader.count()))
+
+    game.game_log = events if events is not None else EventList()
+    _read_events(reader, game.game_log)
+    return game
+
+
+def _write_events(writer: _Writer, events: EventList) -> None:
+    """Append the given event log: its string table, then its events."""
+    strings = {}
+    rows = []
+    for event in events:
+        row = [event.id_num]
+        for name in EVENT_FIELDS:
+            value = getattr(event, name)
+            row.append(NO_STRING if value is None else strings.setdefault(value, len(strings)))
+        rows.append(row)
+
+    writer.pack(_COUNT, len(strings))
+    for string in strings:
+        writer.string(string)
+    writer.pack(_COUNT, len(rows))
+    for row in rows:
+        writer.pack(_EVENT, *row)
+
+
+def _read_events(reader: _Reader, events: EventList) -> None:
+    """Read an event log written by _write_events and add its events to the given empty event list."""
+    strings = [reader.string() for _ in range(reader.count())]
+    command = None
+    for _ in range(reader.count()):
+        id_num, *field_ids = reader.unpack(_EVENT)
+        event = Event(id_num, "")
+        for name, string_id in zip(EVENT_FIELDS, field_ids):
+            setattr(event, name, None if string_id == NO_STRING else strings[string_id])
+        # Each event's next command is the command the following event was added with
+        events.add_event(event, command)
+        command = event.next_command
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+
+    import tempfile
+    import time
+    from proj1_simulation import AdventureGameSimulation
+
+    walkthrough = ["go east", "pick up coffee", "go west", "go north", "pick up notebook", "go south",
+                   "go south", "buy Dry Noodles", "drop notebook", "go north"]
+    played = AdventureGameSimulation('game_data.json', 1, walkthrough, NullSink())._game
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        save_file = os.path.join(tmp_dir, 'session.sav')
+        start_time = time.perf_counter()
+        save_session(played, save_file)
+        save_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        restored = load_session(save_file)
+        load_time = time.perf_counter() - start_time
+        save_size = os.path.getsize(save_file)
+
+        # A save cut short anywhere is rejected instead of being read past its end
+        with open(save_file, 'rb') as save:
+            contents = save.read()
+        for cut in (len(SESSION_MAGIC) + 1, save_size // 2, save_size - 1):
+            with open(save_file, 'wb') as save:
+                save.write(contents[:cut])
+            try:
+                load_session(save_file, NullSink())
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"a save truncated to {cut} bytes was loaded")
+
+    assert restored.player.current_location == played.player.current_location
+    assert (restored.player.coins, restored.player.score) == (played.player.coins, played.player.score)
+    assert [item.name for item in restored.player.inventory] == [item.name for item in played.player.inventory]
+    assert all(restored.get_item_location(item.name) == played.get_item_location(item.name)
+               for item in played.get_items())
+    assert restored.get_visited_locations() == played.get_visited_locations()
+    assert restored.game_log.get_id_log() == played.game_log.get_id_log()
+    assert [e.next_command for e in restored.game_log] == [e.next_command for e in played.game_log]
+    print(f"Saved {save_size} bytes in {save_time * 1000:.2f} ms; restored in {load_time * 1000:.2f} ms")
@@ -21,9 +21,36 @@ please consult our Course Syllabus.
 This file is Copyright (c) 2025 CSC111 Teaching Team
 """
 from __future__ import annotations
+import logging
+from typing import Callable, Optional
+
 from proj1_event_logger import Event, EventList
+from proj1_output import OutputSink, BufferedStdoutSink, NullSink
 from adventure import AdventureGame
 from game_entities import Location
+from proj1_world_loader import World, load_world
+
+_simulation_log = logging.getLogger("adventure.simulation")
+
+# The demonstration walkthroughs of game_data.json, by title: (the id of the start location, the
+# commands, the id log their simulation produces). An id log starts with two events at the start
+# location: the game's "Game started" event and the simulation's first event. proj1_batch checks
+# these walkthroughs too.
+DEMO_WALKTHROUGHS = {
+    # Collects the items for the puzzle and the shop, meeting both NPCs on the way
+    "Win Walkthrough": (1, ["go east", "pick up coffee", "go west", "talk", "go north", "pick up notebook",
+                            "pick up Your STUDENT CARD", "go south", "go south", "talk", "buy dry noodles",
+                            "go north"],
+                        [1, 1, 3, 3, 1, 1, 2, 2, 2, 1, 4, 4, 1]),
+    # Moving in circles without achieving any goal
+    "Lose Walkthrough": (1, ["go east", "go west", "go south", "go north"], [1, 1, 3, 1, 4, 1]),
+    # Picking up and checking items
+    "Inventory Demo": (1, ["go north", "pick up notebook", "inventory", "go south"], [1, 1, 2, 2, 1]),
+    # Talking to an NPC; the notebook is not at location 3, so picking it up fails
+    "Score Demo": (1, ["go east", "pick up notebook", "go west", "talk"], [1, 1, 3, 1, 1]),
+    # Completing a puzzle
+    "Puzzle Demo": (1, ["go east", "solve puzzle", "go west"], [1, 1, 3, 3, 1])
+}
 
 
 class AdventureGameSimulation:
@@ -32,23 +59,41 @@ class AdventureGameSimulation:
     # Private Instance Attributes:
     #   - _game: The AdventureGame instance that this simulation uses.
     #   - _events: A collection of the events to process during the simulation.
+    #   - _output: The sink that the simulation's and the game's text is written to.
+    #   - _headless: Whether the simulation skips rendering text and leaves event descriptions empty.
     _game: AdventureGame
     _events: EventList
+    _output: OutputSink
+    _headless: bool
 
     # TODO: Copy/paste your code from ex1_simulation below, and make adjustments as needed
-    def  __init__(self, game_data_file: str, initial_location_id: int, commands: list[str]) -> None:
+    def  __init__(self, game_data_file: str, initial_location_id: int, commands: list[str],
+                  output: Optional[OutputSink] = None, events: Optional[EventList] = None,
+                  world_loader: Callable[[str], World] = load_world, headless: bool = False) -> None:
         """Initialize a new game simulation based on the given game data, that runs through the given commands.
+        All text is written to output (by default, a BufferedStdoutSink), and events are recorded in the
+        given empty event list (by default, a new EventList). The world is built by calling world_loader
+        on game_data_file, as in AdventureGame.
+
+        A headless simulation renders no text of its own, writes the game's text to a NullSink unless
+        output is given, and records its events with empty descriptions; run looks those descriptions up.
 
         Preconditions:
         - len(commands) > 0
         - all commands in the given list are valid commands at each associated location in the game
         """
-        self._events = EventList()
-        self._game = AdventureGame(game_data_file, initial_location_id, self._events)
+        self._headless = headless
+        if output is None:
+            output = NullSink() if headless else BufferedStdoutSink()
+        self._output = output
+        self._events = events if events is not None else EventList()
+        self._game = AdventureGame(game_data_file, initial_location_id, self._events, world_loader=world_loader,
+                                   output=self._output)
 
         # Add first event (initial location, no previous command)
         initial_location = self._game.get_location()
-        first_event = Event(id_num=initial_location.id_num, description=initial_location.long_description)
+        first_event = Event(id_num=initial_location.id_num,
+                            description="" if headless else initial_location.long_description)
         self._events.add_event(first_event)
 
         # Generate the remaining events based on the commands
@@ -61,18 +106,32 @@ class AdventureGameSimulation:
         - len(commands) > 0
         - all commands in the given list are valid commands at each associated location in the game
         """
+        verbose = not self._headless
         for command in commands:
-            print(f"Executing: {command}")
-            prev_location_id = self._game.player.current_location  # Store previous location before executing command
-
-            if command in ["look", "inventory", "score", "undo", "log", "quit"]:
-                self._game.handle_command(command, self._events)
-
-            else:
-                self._game.handle_special_command(command, self._events)
-
-            new_location_id = self._game.player.current_location
-            print(f"Moved from {prev_location_id} to {new_location_id}")
+            if verbose:
+                # Flush whatever the previous command left buffered
+                self._output.flush()
+                self._output.write(f"Executing: {command}")
+            player = self._game.player
+            prev_location_id = player.current_location  # Store previous location before executing command
+
+            parsed = self._game.parse_command(command)
+            verb = parsed.verb if parsed is not None else None
+            # What the command can do is decided by the state before it runs: how many of the named
+            # item the player carries, whether the NPC's mission is complete, and whether the puzzle
+            # can be solved
+            item_count = player.inventory.count(parsed.argument) if verb in ("pick up", "drop") else 0
+            npc = self._game.npcs.first_at(prev_location_id) if verb == "talk" else None
+            mission_ready = npc is not None and bool(npc.mission_items) and player.has_all(npc.mission_items)
+            location = self._game.get_location() if verb == "solve puzzle" else None
+            puzzle_solvable = (location is not None and bool(location.puzzle)
+                               and (not location.condition_to_unlock or player.has_item(location.condition_to_unlock)))
+            if parsed is not None:
+                self._game.execute_command(parsed, self._events)
+
+            new_location_id = player.current_location
+            if verbose:
+                self._output.write(f"Moved from {prev_location_id} to {new_location_id}")
 
             event_type = None
             affected_item = None
@@ -80,48 +139,37 @@ class AdventureGameSimulation:
             mission_completed = None
 
             # Detect the event type
-            if command.startswith("go "):
+            if verb == "go":
                 event_type = "move"
-            elif command.startswith("pick up "):
-                item_name = command[8:].strip()
-                print(
-                    f"DEBUG: Attempting to pick up {item_name} at location {self._game.player.current_location}")
-                if self._game.player.has_item(item_name):
-                    print(f"You already have {item_name}.")
-                    continue
-                elif any(item_name.lower() == item.lower() for item in
-                             self._game.get_location().items):
-                    item_obj = next((item for item in self._game.get_items() if item.name == item_name), None)
-                    if item_obj:
-                        self._game.player.add_item(item_obj)
-                        event_type = "pickup"
-                        affected_item = item_name
-                    else:
-                        print(f"Error: Could not find full item data for '{item_name}'")
+            elif verb == "pick up":
+                _simulation_log.debug("Attempting to pick up %s at location %s", parsed.argument, prev_location_id)
+                if player.inventory.count(parsed.argument) > item_count:
+                    event_type = "pickup"
+                    affected_item = parsed.argument
                 else:
-                    print(f"{item_name} is not here.")
-                    continue
-            elif command.startswith("drop "):
-                event_type = "drop"
-                affected_item = command[5:]  # Extract item name
-            elif command == "talk":
-                npc = next((npc for npc in self._game.npcs if npc.location == new_location_id), None)
-                if npc:
-                    event_type = "mission" if npc.mission_items else "talk"
-                    mission_completed = npc.name if npc.mission_items else None
-            elif command == "solve puzzle":
-                location = self._game.get_location()
-                if hasattr(location, "puzzle") and location.puzzle:
+                    self._output.write(f"{parsed.argument} is not here.")
+            elif verb == "drop":
+                if player.inventory.count(parsed.argument) < item_count:
+                    event_type = "drop"
+                    affected_item = parsed.argument
+            elif verb == "talk":
+                if mission_ready:
+                    event_type = "mission"
+                    mission_completed = npc.name
+                elif npc is not None:
+                    event_type = "talk"
+            elif verb == "solve puzzle":
+                if puzzle_solvable:
                     event_type = "puzzle"
                     puzzle_completed = f"Solved {location.puzzle}"
-                    print(f"Puzzle solved: {location.puzzle}")
-                else:
-                    print("There is no puzzle to solve here.")
+                    self._output.write(f"Puzzle solved: {location.puzzle}")
+                elif location is None or not location.puzzle:
+                    self._output.write("There is no puzzle to solve here.")
 
-            if event_type or (prev_location_id != new_location_id and self._events.get_id_log()[-1] != new_location_id):
+            if event_type or (prev_location_id != new_location_id and self._events.last.id_num != new_location_id):
                 new_event = Event(
                     id_num=new_location_id,
-                    description=self._game.get_location().long_description,
+                    description=self._game.get_location().long_description if verbose else "",
                     next_command=command,
                     event_type=event_type,
                     affected_item=affected_item,
@@ -129,6 +177,7 @@ class AdventureGameSimulation:
                     mission_completed=mission_completed
                 )
                 self._events.add_event(new_event, command)
+        self._output.flush()
 
     def get_id_log(self) -> list[int]:
         """
@@ -149,15 +198,20 @@ class AdventureGameSimulation:
         return self._events.get_id_log()
 
     def run(self) -> None:
-        """Run the game simulation and log location descriptions."""
-        current_event = self._events.first  # Start from the first event in the list
-
-        while current_event:
-            print(current_event.description)
-            if current_event is not self._events.last:
-                print("You choose:", current_event.next_command)
-
-            current_event = current_event.next
+        """Run the game simulation and log location descriptions.
+        The empty descriptions of a headless simulation's events are looked up in the world.
+        """
+        previous_event = None
+        for current_event in self._events:
+            # Every event but the last is followed by the command chosen after it
+            if previous_event is not None:
+                self._output.write(f"You choose: {previous_event.next_command}")
+            if self._headless and not current_event.description:
+                self._output.write(self._game.get_location(current_event.id_num).long_description)
+            else:
+                self._output.write(current_event.description)
+            previous_event = current_event
+        self._output.flush()
 
 
 if __name__ == "__main__":
@@ -170,57 +224,8 @@ if __name__ == "__main__":
     #     'disable': ['R1705', 'E9998', 'E9999']
     # })
 
-    win_walkthrough = [
-        "go east",
-        "pick up coffee",
-        "go west",
-        "talk",
-        "go north",
-        "pick up notebook",
-        "pick up Your STUDENT CARD",
-        "go south",
-        "go south",
-        "talk",
-        "buy dry noodles",
-        "go north"
-    ]
-
-    expected_log = [1, 1, 3, 3, 1, 1, 1, 2, 2, 1, 1, 4, 4, 4, 1, 1]
-    win_simulation = AdventureGameSimulation('game_data.json', 0, win_walkthrough)
-    print(win_simulation.get_id_log())
-    assert win_simulation.get_id_log() == expected_log
-
-
-    print("\n--- Win Walkthrough ---")
-    win_simulation.run()
-
-    # Lose demo: Moving in circles without achieving any goal
-    lose_demo = ["go east", "go west", "go south", "go north"]
-    expected_log = [1, 1, 3, 3, 1, 1, 1, 2, 2]
-    lose_simulation = AdventureGameSimulation('game_data.json', 0, lose_demo)
-    assert lose_simulation.get_id_log() == expected_log
-    print("\n--- Lose Walkthrough ---")
-    lose_simulation.run()
-
-    # Inventory demonstration: Picking up and checking items
-    inventory_demo = [
-        "go north",
-        "pick up notebook",
-        "inventory",
-        "go south"
-    ]
-    inventory_simulation = AdventureGameSimulation('game_data.json', 1, inventory_demo)
-    print("\n--- Inventory Demo ---")
-    inventory_simulation.run()
-
-    # Score demonstration: Gaining points from completing missions
-    score_demo = ["go east", "pick up notebook", "go west", "talk"]
-    score_simulation = AdventureGameSimulation('game_data.json', 1, score_demo)
-    print("\n--- Score Demo ---")
-    score_simulation.run()
-
-    # Puzzle demonstration: Completing a puzzle
-    puzzle_demo = ["go east", "solve puzzle", "go west"]
-    puzzle_simulation = AdventureGameSimulation('game_data.json', 1, puzzle_demo)
-    print("\n--- Puzzle Demo ---")
-    puzzle_simulation.run()
+    for title, (start_id, demo_commands, expected_log) in DEMO_WALKTHROUGHS.items():
+        simulation = AdventureGameSimulation('game_data.json', start_id, demo_commands)
+        assert simulation.get_id_log() == expected_log, (title, simulation.get_id_log())
+        print(f"\n--- {title} ---")
+        simulation.run()
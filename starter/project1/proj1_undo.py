@@ -0,0 +1,233 @@
+"""CSC111 Project 1: Text Adventure Game - Undo History
+
+Module Description
+==================
+
+This module contains UndoHistory, which lets AdventureGame undo commands completely: the
+player's location, coins, score, move count and inventory, the items lying in the world, the
+locations marked visited, and the events the command added to the event log.
+
+While a command runs, the history collects a StateDelta of the state it changes. The player's
+scalar fields are copied when the command starts, and the inventory and item placements append
+each of their changes to the delta (see Inventory.changes and PlacementOverlay.changes). Undoing a
+command applies its delta backwards, so it takes time proportional to what the command changed.
+
+Only the last max_deltas deltas are kept, which caps the memory of long sessions. Every
+snapshot_interval commands a Snapshot of the whole mutable state is also kept, so undoing many
+commands at once restores the nearest snapshot and applies fewer than snapshot_interval deltas.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from game_entities import Item, PlacementOverlay, Player, VisitedSet
+from proj1_event_logger import EventList
+
+
+@dataclass(slots=True)
+class StateDelta:
+    """The state changed by one command, recorded so the command can be undone.
+
+    Instance Attributes:
+        - location: The player's location before the command.
+        - coins: The player's coins before the command.
+        - score: The player's score before the command.
+        - moves_made: The game's move count before the command.
+        - log_length: The length of the event log before the command.
+        - inventory: The inventory's changes, in order (see Inventory.changes).
+        - placements: The item placements' changes, in order (see PlacementOverlay.changes).
+        - visited: The ids of the locations first marked visited by the command.
+    """
+    location: int
+    coins: int
+    score: int
+    moves_made: int
+    log_length: int
+    inventory: list[tuple[int, Optional[Item]]] = field(default_factory=list)
+    placements: list[tuple[str, Optional[int]]] = field(default_factory=list)
+    visited: list[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Snapshot:
+    """The whole mutable game state after a given number of commands.
+
+    Instance Attributes:
+        - position: The number of commands recorded in the history when the snapshot was taken.
+        - location: The player's location.
+        - coins: The player's coins.
+        - score: The player's score.
+        - inventory: The (sequence number, item) pairs carried by the player, in order.
+        - moved: A copy of the placements' differences from the world's (see PlacementOverlay.moved).
+        - visited: The visited locations, as a VisitedSet bitset.
+    """
+    position: int
+    location: int
+    coins: int
+    score: int
+    inventory: tuple[tuple[int, Item], ...]
+    moved: dict[str, Optional[int]]
+    visited: bytes
+
+
+class UndoHistory:
+    """The recent commands of one game, as deltas that can be undone.
+
+    Instance Attributes:
+        - max_deltas: The most commands that can be undone; older deltas are discarded.
+        - snapshot_interval: The number of commands between snapshots.
+        - deltas: The deltas of the undoable commands, oldest first.
+        - snapshots: The snapshots taken at or after the oldest undoable command, oldest first.
+        - position: The number of commands recorded so far, minus the number undone.
+
+    Representation Invariants:
+        - self.max_deltas > 0 and self.snapshot_interval > 0
+        - len(self.deltas) <= self.max_deltas
+        - all(self.position - len(self.deltas) <= s.position <= self.position for s in self.snapshots)
+    """
+    max_deltas: int
+    snapshot_interval: int
+    deltas: deque[StateDelta]
+    snapshots: deque[Snapshot]
+    position: int
+    # Private Instance Attributes:
+    #   - _player, _visited, _placements: the game state the history records.
+    #   - _current: the delta of the command being run (or last run), not yet added to deltas.
+    _player: Player
+    _visited: VisitedSet
+    _placements: PlacementOverlay
+    _current: Optional[StateDelta]
+
+    def __init__(self, player: Player, visited: VisitedSet, placements: PlacementOverlay,
+                 max_deltas: int = 1000, snapshot_interval: int = 50) -> None:
+        """Initialize an empty history of the given game state. The player's inventory and the
+        placements are not changed until the first command begins."""
+        self.max_deltas = max_deltas
+        self.snapshot_interval = snapshot_interval
+        self.deltas = deque(maxlen=max_deltas)
+        self.snapshots = deque()
+        self.position = 0
+        self._player = player
+        self._visited = visited
+        self._placements = placements
+        self._current = None
+
+    def begin(self, log: EventList, moves_made: int) -> None:
+        """Start recording a new command, run on the given event log with the given move count."""
+        self._commit(log, moves_made)
+        player = self._player
+        self._current = StateDelta(player.current_location, player.coins, player.score, moves_made, len(log))
+        player.inventory.changes = self._current.inventory
+        self._placements.changes = self._current.placements
+
+    def record_visit(self, location_id: int) -> None:
+        """Record that the location with the given id has just been marked visited."""
+        if self._current is not None:
+            self._current.visited.append(location_id)
+
+    def undo(self, log: EventList, steps: int = 1) -> Optional[int]:
+        """Undo the last steps commands (not counting the one being run) and the events they added to
+        the given log. Return the move count to restore, or None if there are fewer than steps commands
+        to undo, in which case nothing is changed.
+        """
+        self._stop_recording()
+        self._current = None
+        if steps <= 0 or steps > len(self.deltas):
+            return None
+
+        target = self.position - steps
+        first_undone = self.deltas[-steps]
+        snapshot = next((s for s in self.snapshots if s.position >= target), None)
+        if snapshot is not None and self.position - snapshot.position > self.snapshot_interval:
+            # Restoring the snapshot is cheaper than undoing every delta after it
+            while self.position > snapshot.position:
+                self.deltas.pop()
+                self.position -= 1
+            self._restore(snapshot)
+        while self.position > target:
+            self._revert(self.deltas.pop())
+            self.position -= 1
+
+        while self.snapshots and self.snapshots[-1].position > self.position:
+            self.snapshots.pop()
+        while len(log) > first_undone.log_length:
+            log.remove_last_event()
+        return first_undone.moves_made
+
+    def _commit(self, log: EventList, moves_made: int) -> None:
+        """Add the delta of the last command to the history, unless the command changed nothing."""
+        self._stop_recording()
+        delta, self._current = self._current, None
+        if delta is None:
+            return
+        player = self._player
+        if (delta.inventory or delta.placements or delta.visited or len(log) != delta.log_length
+                or (delta.location, delta.coins, delta.score, delta.moves_made)
+                != (player.current_location, player.coins, player.score, moves_made)):
+            self.deltas.append(delta)
+            self.position += 1
+            while self.snapshots and self.snapshots[0].position < self.position - len(self.deltas):
+                self.snapshots.popleft()
+            if self.position % self.snapshot_interval == 0:
+                self.snapshots.append(self._snapshot())
+
+    def _stop_recording(self) -> None:
+        """Stop the inventory and placements from recording their changes."""
+        self._player.inventory.changes = None
+        self._placements.changes = None
+
+    def _revert(self, delta: StateDelta) -> None:
+        """Undo the changes recorded in the given delta, most recent first."""
+        player = self._player
+        player.current_location, player.coins, player.score = delta.location, delta.coins, delta.score
+        for seq, item in reversed(delta.inventory):
+            if item is None:
+                player.inventory.discard_newest(seq)
+            else:
+                player.inventory.restore_oldest(seq, item)
+        for item_name, previous in reversed(delta.placements):
+            if previous is None:
+                self._placements.remove(item_name)
+            else:
+                self._placements.place(item_name, previous)
+        for location_id in delta.visited:
+            self._visited.discard(location_id)
+
+    def _snapshot(self) -> Snapshot:
+        """Return a snapshot of the current state."""
+        player = self._player
+        return Snapshot(self.position, player.current_location, player.coins, player.score,
+                        tuple(player.inventory.by_order.items()), dict(self._placements.moved),
+                        self._visited.to_bytes())
+
+    def _restore(self, snapshot: Snapshot) -> None:
+        """Set the current state to the given snapshot's."""
+        player = self._player
+        player.current_location, player.coins, player.score = snapshot.location, snapshot.coins, snapshot.score
+        player.inventory.reset(snapshot.inventory)
+        self._placements.restore(snapshot.moved)
+        self._visited.restore(snapshot.visited)
+
+
+if __name__ == "__main__":
+    pass
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
@@ -0,0 +1,253 @@
+"""CSC111 Project 1: Text Adventure Game - Random Walk Analysis
+
+Module Description
+==================
+
+This module answers design questions about a world's map, such as "how likely is a player who
+wanders at random to reach location X within move_limit moves?", for millions of players at once.
+
+A random player at a location picks one of its exits (the movement commands of
+available_commands) uniformly at random, so the map is a Markov chain. compile_transitions
+turns the world's exits into a sparse transition matrix, stored as NumPy arrays in compressed
+sparse row form: the exits of the location at index i are the entries indptr[i]:indptr[i + 1]
+of targets and probabilities. A location with no exits keeps the player where they are.
+
+Two kinds of analysis are provided:
+    - exact propagation (hitting_probabilities and visit_distribution), which pushes the
+      probability distribution of every player's location through the matrix one move at a
+      time, in time proportional to move_limit times the number of exits
+    - Monte Carlo simulation (simulate_walks), which moves an array of simulated players all
+      at once, and also gives the distribution of the number of moves each target takes to reach
+
+This module needs NumPy (see requirements.txt).
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from game_entities import Location
+from proj1_world_loader import load_world
+
+@dataclass(frozen=True)
+class TransitionMatrix:
+    """The transition matrix of a random player's moves, in compressed sparse row form.
+
+    Instance Attributes:
+        - location_ids: The id of the location at each index, in increasing order.
+        - indptr: The exits of the location at index i are entries indptr[i]:indptr[i + 1].
+        - sources: The index of the location each entry leaves from.
+        - targets: The index of the location each entry leads to.
+        - probabilities: The probability a player at the entry's source takes the entry.
+
+    Representation Invariants:
+        - len(self.indptr) == len(self.location_ids) + 1
+        - len(self.sources) == len(self.targets) == len(self.probabilities) == self.indptr[-1]
+        - every location has at least one entry, and the probabilities of its entries sum to 1
+    """
+    location_ids: np.ndarray
+    indptr: np.ndarray
+    sources: np.ndarray
+    targets: np.ndarray
+    probabilities: np.ndarray
+
+    def index_of(self, location_id: int) -> int:
+        """Return the index of the location with the given id.
+
+        Raise a KeyError if there is no such location.
+        """
+        index = int(np.searchsorted(self.location_ids, location_id))
+        if index == len(self.location_ids) or self.location_ids[index] != location_id:
+            raise KeyError(location_id)
+        return index
+
+    def step(self, distribution: np.ndarray) -> np.ndarray:
+        """Return the distribution of a player's location one move after the given distribution."""
+        return np.bincount(self.targets, weights=distribution[self.sources] * self.probabilities,
+                           minlength=len(self.location_ids))
+
+
+@dataclass
+class WalkResult:
+    """The results of simulating many random players.
+
+    Instance Attributes:
+        - num_players: The number of players simulated.
+        - move_limit: The number of moves each player made.
+        - target_ids: The ids of the locations whose hitting times were recorded.
+        - hit_counts: For each target (row) and k from 0 to move_limit (column), the number of players
+          who first reached the target after k moves.
+        - visit_counts: The number of times players were at each location (by index), counting the start.
+
+    Representation Invariants:
+        - self.hit_counts.shape == (len(self.target_ids), self.move_limit + 1)
+        - all(self.hit_counts.sum(axis=1) <= self.num_players)
+    """
+    num_players: int
+    move_limit: int
+    target_ids: list[int]
+    hit_counts: np.ndarray
+    visit_counts: np.ndarray
+
+    def hitting_probability(self, target_id: int, within: Optional[int] = None) -> float:
+        """Return the fraction of players who reached the given target within the given number of
+        moves (by default, the move limit)."""
+        counts = self.hit_counts[self.target_ids.index(target_id), :self._last_move(within) + 1]
+        return float(counts.sum()) / self.num_players
+
+    def mean_hitting_moves(self, target_id: int, within: Optional[int] = None) -> Optional[float]:
+        """Return the mean number of moves taken by the players who reached the given target within
+        the given number of moves (by default, the move limit), or None if no player did."""
+        counts = self.hit_counts[self.target_ids.index(target_id), :self._last_move(within) + 1]
+        reached = counts.sum()
+        return float(np.dot(counts, np.arange(len(counts)))) / reached if reached else None
+
+    def _last_move(self, within: Optional[int]) -> int:
+        """Return the last move counted when asked about the players who reached a target within the
+        given number of moves (None for the move limit)."""
+        return self.move_limit if within is None else min(within, self.move_limit)
+
+
+def compile_transitions(locations: Mapping[int, Location]) -> TransitionMatrix:
+    """Return the transition matrix of a random player in the given locations, who takes each exit of
+    their location with equal probability (so two exits to the same place count twice)."""
+    location_ids = np.array(sorted(locations), dtype=np.int64)
+    index = {int(location_id): i for i, location_id in enumerate(location_ids)}
+    counts = np.empty(len(location_ids), dtype=np.int64)
+    sources, targets = [], []
+    for i, location_id in enumerate(location_ids):
+        exit_targets = [index[target] for _, target in locations[int(location_id)].exits.items() if target in index]
+        if not exit_targets:
+            exit_targets = [i]
+        counts[i] = len(exit_targets)
+        sources.extend([i] * len(exit_targets))
+        targets.extend(exit_targets)
+
+    indptr = np.zeros(len(location_ids) + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    sources = np.array(sources, dtype=np.int64)
+    return TransitionMatrix(location_ids, indptr, sources, np.array(targets, dtype=np.int64),
+                            1.0 / counts[sources])
+
+
+def hitting_probabilities(matrix: TransitionMatrix, start_id: int, target_id: int, move_limit: int) -> np.ndarray:
+    """Return an array whose k-th entry is the exact probability that a random player starting at
+    start_id has reached target_id within k moves, for k from 0 to move_limit."""
+    target = matrix.index_of(target_id)
+    distribution = np.zeros(len(matrix.location_ids))
+    distribution[matrix.index_of(start_id)] = 1.0
+    reached = np.empty(move_limit + 1)
+    reached[0] = distribution[target]
+    distribution[target] = 0.0
+    for k in range(1, move_limit + 1):
+        # Players who reach the target stop counting, so each is only counted once
+        distribution = matrix.step(distribution)
+        reached[k] = reached[k - 1] + distribution[target]
+        distribution[target] = 0.0
+    return reached
+
+
+def visit_distribution(matrix: TransitionMatrix, start_id: int, move_limit: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return (the probability of a random player starting at start_id being at each location after
+    move_limit moves, the expected number of times they are at each location in those moves,
+    counting the start), both indexed like matrix.location_ids."""
+    distribution = np.zeros(len(matrix.location_ids))
+    distribution[matrix.index_of(start_id)] = 1.0
+    expected_visits = distribution.copy()
+    for _ in range(move_limit):
+        distribution = matrix.step(distribution)
+        expected_visits += distribution
+    return distribution, expected_visits
+
+
+def simulate_walks(matrix: TransitionMatrix, start_id: int, target_ids: list[int], num_players: int,
+                   move_limit: int, seed: Optional[int] = None, batch_size: int = 1 << 20) -> WalkResult:
+    """Simulate num_players random players starting at start_id making move_limit moves each, and
+    return the results, counting the move on which each player first reaches each of target_ids.
+
+    Players are moved together, batch_size at a time, so memory stays proportional to batch_size
+    times the number of targets.
+
+    Preconditions:
+        - target_ids has no duplicates
+    """
+    rng = np.random.default_rng(seed)
+    start = matrix.index_of(start_id)
+    # The column of hit_counts for each location index, or -1 for a location that is not a target
+    column_of = np.full(len(matrix.location_ids), -1, dtype=np.int64)
+    for column, target_id in enumerate(target_ids):
+        column_of[matrix.index_of(target_id)] = column
+    degrees = np.diff(matrix.indptr)
+    hit_counts = np.zeros((len(target_ids), move_limit + 1), dtype=np.int64)
+    visit_counts = np.zeros(len(matrix.location_ids), dtype=np.int64)
+
+    for first in range(0, num_players, batch_size):
+        batch = min(batch_size, num_players - first)
+        # Whether each player (row) of this batch has reached each target (column) yet
+        reached = np.zeros((batch, len(target_ids)), dtype=bool)
+        positions = np.full(batch, start, dtype=np.int64)
+        if column_of[start] >= 0:
+            reached[:, column_of[start]] = True
+            hit_counts[column_of[start], 0] += batch
+        visit_counts[start] += batch
+        for move in range(1, move_limit + 1):
+            offsets = (rng.random(batch) * degrees[positions]).astype(np.int64)
+            positions = matrix.targets[matrix.indptr[positions] + offsets]
+            visit_counts += np.bincount(positions, minlength=len(visit_counts))
+            players = np.flatnonzero(column_of[positions] >= 0)
+            columns = column_of[positions[players]]
+            first_time = ~reached[players, columns]
+            reached[players[first_time], columns[first_time]] = True
+            hit_counts[:, move] += np.bincount(columns[first_time], minlength=len(target_ids))
+    return WalkResult(num_players, move_limit, list(target_ids), hit_counts, visit_counts)
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+
+    game_locations = load_world('game_data.json').locations
+    transitions = compile_transitions(game_locations)
+    start_location, limit, players = 1, 30, 1_000_000
+    # A location with a step limit is analysed over that many moves
+    limits = {location_id: game_locations[location_id].steps_allowed or limit for location_id in game_locations}
+    all_ids = [int(location_id) for location_id in transitions.location_ids]
+
+    start_time = time.perf_counter()
+    result = simulate_walks(transitions, start_location, all_ids, players, max(limits.values()), seed=111)
+    seconds = time.perf_counter() - start_time
+    print(f"Simulated {players:,} players x {result.move_limit} moves in {seconds:.2f} s "
+          f"({players * result.move_limit / seconds:,.0f} moves/s)")
+
+    final, visits = visit_distribution(transitions, start_location, result.move_limit)
+    print(f"{'location':>8} {'P(reach) exact':>15} {'simulated':>10} {'mean moves':>11} "
+          f"{'P(end here)':>12} {'visits/player':>14}")
+    for i, location_id in enumerate(all_ids):
+        exact = hitting_probabilities(transitions, start_location, location_id, limits[location_id])[-1]
+        simulated = result.hitting_probability(location_id, limits[location_id])
+        mean_moves = result.mean_hitting_moves(location_id, limits[location_id])
+        mean_text = "-" if mean_moves is None else f"{mean_moves:.2f}"
+        print(f"{location_id:>8} {exact:>15.4f} {simulated:>10.4f} {mean_text:>11} "
+              f"{final[i]:>12.4f} {result.visit_counts[i] / players:>14.3f}")
+        # The simulated probability is within about 5 standard errors of the exact one
+        assert abs(simulated - exact) < 5 * max(np.sqrt(exact * (1 - exact) / players), 1e-6)
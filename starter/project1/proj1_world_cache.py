@@ -0,0 +1,170 @@
+"""CSC111 Project 1: Text Adventure Game - Compiled World Cache
+
+Module Description
+==================
+
+This module compiles a fully built world (locations, items, NPCs and their indexes) into a
+binary file stored next to its game data JSON file, so later runs can load the world without
+parsing the JSON or running any entity constructors.
+
+A compiled world is only used if it was built from a JSON file with exactly the same contents
+and with the current WORLD_SCHEMA_VERSION; otherwise it is rebuilt. A compiled world also
+records the size and modification time the JSON file had when it was compiled, and the file is
+only hashed to check its contents when either of them has changed. Cache files are unpickled,
+so only load cache files you created yourself.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import gc
+import hashlib
+import os
+import pickle
+import time
+from typing import Optional
+
+from proj1_world_loader import World, load_world
+
+# Bump this whenever the entity classes or the World layout change, so stale caches are rebuilt.
+WORLD_SCHEMA_VERSION = 8
+
+CACHE_MAGIC = b"CSC111-WORLD"
+CACHE_SUFFIX = ".worldcache"
+
+
+def file_stamp(game_data_file: str) -> tuple[int, int]:
+    """Return the size and modification time (in nanoseconds) of the given game data file."""
+    stat = os.stat(game_data_file)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def cache_path_for(game_data_file: str) -> str:
+    """Return the name of the compiled world file for the given game data file."""
+    return os.path.splitext(game_data_file)[0] + CACHE_SUFFIX
+
+
+def hash_game_data(game_data_file: str) -> str:
+    """Return the hex SHA-256 digest of the contents of the given game data file."""
+    digest = hashlib.sha256()
+    with open(game_data_file, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compile_world(game_data_file: str, cache_file: Optional[str] = None) -> World:
+    """Build the world described by the given game data file, write it to cache_file (by default,
+    next to the game data file) and return it."""
+    # The stamp is taken first, so a change made while the file is read makes the stamp stale
+    stamp = file_stamp(game_data_file)
+    world = load_world(game_data_file)
+    _write_cache(world, world.source_hash, stamp, cache_file or cache_path_for(game_data_file))
+    return world
+
+
+def load_cached_world(game_data_file: str) -> World:
+    """Return the world described by the given game data file, loading it from its compiled world
+    file when that is up to date, and compiling it first otherwise.
+
+    The game data file is only hashed if its size or modification time differs from the one
+    recorded in the compiled world file; if its contents turn out to be unchanged, the compiled
+    world is stamped again so the next load does not hash it either.
+
+    The returned world's timings record a "cache" phase (and a "hash" phase, if the file was
+    hashed) on a cache hit, and the usual load phases on a miss.
+    """
+    cache_file = cache_path_for(game_data_file)
+    stamp = file_stamp(game_data_file)
+    start = time.perf_counter()
+    header = _read_header(cache_file)
+    if header is not None and header[1] == stamp:
+        world = _read_cache(cache_file, header[0])
+        if world is not None:
+            world.timings = {'cache': time.perf_counter() - start}
+            return world
+
+    start = time.perf_counter()
+    source_hash = hash_game_data(game_data_file)
+    hash_time = time.perf_counter() - start
+    start = time.perf_counter()
+    world = _read_cache(cache_file, source_hash)
+    if world is not None:
+        world.timings = {'hash': hash_time, 'cache': time.perf_counter() - start}
+        _write_cache(world, source_hash, stamp, cache_file)
+        return world
+
+    world = load_world(game_data_file)
+    _write_cache(world, world.source_hash, stamp, cache_file)
+    return world
+
+
+def load_compiled_world(game_data_file: str, source_hash: str) -> Optional[World]:
+    """Return the world stored in the compiled world file of the given game data file, without
+    reading the game data file itself, or None if there is no compiled world for game data with the
+    given hash."""
+    return _read_cache(cache_path_for(game_data_file), source_hash)
+
+
+def _read_header(cache_file: str) -> Optional[tuple[str, tuple[int, int]]]:
+    """Return (the hash, the file stamp) of the game data the given cache file was compiled from,
+    or None if the file is missing, unreadable, or has a different schema version."""
+    try:
+        with open(cache_file, 'rb') as f:
+            header = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+        return None
+    if not isinstance(header, tuple) or len(header) != 4 or header[:2] != (CACHE_MAGIC, WORLD_SCHEMA_VERSION):
+        return None
+    return header[2], header[3]
+
+
+def _read_cache(cache_file: str, source_hash: str) -> Optional[World]:
+    """Return the world stored in the given cache file, or None if the file is missing, unreadable,
+    or was compiled from different game data or with a different schema version."""
+    # Unpickling creates millions of objects and none of them are garbage, so pausing the cyclic
+    # garbage collector roughly halves the load time.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(cache_file, 'rb') as f:
+            header = pickle.load(f)
+            if not isinstance(header, tuple) or header[:3] != (CACHE_MAGIC, WORLD_SCHEMA_VERSION, source_hash):
+                return None
+            world = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+        return None
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return world if isinstance(world, World) else None
+
+
+def _write_cache(world: World, source_hash: str, stamp: tuple[int, int], cache_file: str) -> None:
+    """Write the given world, compiled from game data with the given hash and file stamp, to the
+    given cache file, replacing it atomically."""
+    tmp_file = cache_file + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        pickle.dump((CACHE_MAGIC, WORLD_SCHEMA_VERSION, source_hash, stamp), f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(world, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, cache_file)
+
+
+if __name__ == "__main__":
+    pass
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
@@ -0,0 +1,381 @@
+"""CSC111 Project 1: Text Adventure Game - World Loader
+
+Module Description
+==================
+
+This module builds the game world (locations, items and NPCs) from a game data file.
+The file is parsed once, and every part of the world is built from the same parsed
+document. The time spent in each phase is recorded so startup regressions are easy to spot.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import hashlib
+import itertools
+import json
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Optional
+
+from game_entities import (Location, Item, ItemCatalog, ItemPlacements, NPC, NPCRegistry, PlacementOverlay,
+                           StringPool, VisitedSet)
+from proj1_pathfinding import PathFinder
+from proj1_world_store import ArrayLocations
+
+
+@dataclass
+class World:
+    """Everything loaded from a game data file.
+
+    A world loaded from a file is a template: World.spawn returns a world for one game session,
+    which shares everything with the template except its item placements (a PlacementOverlay)
+    and visited set. Games never change locations, items or NPCs, so the spawned worlds also
+    share the template's PathFinder and the routes it has cached.
+
+    Instance Attributes:
+        - locations: A mapping from location id to Location object. In a lazy world this is a
+          LazyLocations, which only builds a Location the first time it is looked up, and in a
+          compact world it is an ArrayLocations, which stores locations in typed arrays.
+        - items: Every item in the game, indexed by name.
+        - placements: Where each item currently lies in the world.
+        - visited: The ids of the locations visited so far.
+        - npcs: The non-player characters in the game, indexed by name and location.
+        - strings: The pool every description, command, item name and NPC name in the world was
+          interned through.
+        - timings: A mapping from each load phase ("parse", "hash", "locations", "items", "npcs") to the
+          number of seconds it took.
+        - routes: The shortest routes between the locations. A new PathFinder is made if none is given.
+        - source_hash: The hex SHA-256 digest of the game data file this world was loaded from, or
+          None if it was not loaded from a file.
+        - puzzle_locations: The ids of the locations with a puzzle, found from the location records
+          so that listing them never builds a Location.
+
+    Representation Invariants:
+        - all(loc_id == location.id_num for loc_id, location in self.locations.items())
+        - all(time_taken >= 0 for time_taken in self.timings.values())
+    """
+    locations: Mapping[int, Location]
+    items: ItemCatalog
+    placements: ItemPlacements | PlacementOverlay
+    npcs: NPCRegistry
+    strings: StringPool = field(default_factory=StringPool)
+    timings: dict[str, float] = field(default_factory=dict)
+    visited: VisitedSet = field(default_factory=VisitedSet)
+    routes: Optional[PathFinder] = None
+    source_hash: Optional[str] = None
+    puzzle_locations: list[int] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        """Give this world a PathFinder over its locations, unless it was given one to share."""
+        if self.routes is None:
+            self.routes = PathFinder(self.locations)
+
+    def spawn(self) -> World:
+        """Return a World for a new game session played on this world, in constant time.
+
+        The new world shares this world's locations, items, NPCs and string pool, and starts with
+        this world's item placements and no visited locations. Changes to its placements are
+        kept in an overlay and never reach this world.
+
+        Preconditions:
+            - isinstance(self.placements, ItemPlacements)
+        """
+        return World(self.locations, self.items, PlacementOverlay(self.placements), self.npcs, self.strings,
+                     routes=self.routes, source_hash=self.source_hash, puzzle_locations=self.puzzle_locations)
+
+
+def location_from_record(loc: dict[str, Any], strings: StringPool) -> Location:
+    """Return the Location described by the given location record of a game data file,
+    interning its strings through the given pool."""
+    intern = strings.intern
+    return Location(
+        location_id=loc['id'],
+        brief_description=intern(loc.get('brief_description', "No brief description available.")),
+        long_description=intern(loc.get('long_description', "No long description available.")),
+        available_commands={intern(command): target for command, target in loc.get('available_commands', {}).items()},
+        items=strings.intern_all(loc.get('items', [])),
+        rooms_contained=strings.intern_all(loc.get('rooms_contained', [])),
+        condition_to_unlock=intern(loc.get('condition_to_unlock', None)),
+        steps_allowed=loc.get('steps_allowed', None),
+        npc=intern(loc.get('npc', None)),
+        puzzle=intern(loc.get('puzzle', None))
+    )
+
+
+def item_from_record(item: dict[str, Any], strings: StringPool) -> Item:
+    """Return the Item described by the given item record of a game data file,
+    interning its strings through the given pool."""
+    intern = strings.intern
+    return Item(
+        name=intern(item['name']),
+        start_position=item.get('start_position', -1),
+        target_position=item.get('target_position', None),
+        target_points=item.get('target_points', 0),
+        function=intern(item.get('function', None)),
+        items_contained=strings.intern_all(item.get('items_contained', [])),
+        condition_to_unlock=intern(item.get('condition_to_unlock', None)),
+        coins=item.get('coins', 0)
+    )
+
+
+def npc_from_record(npc_data: dict[str, Any], strings: StringPool) -> NPC:
+    """Return the NPC described by the given NPC record of a game data file,
+    interning its strings through the given pool."""
+    intern = strings.intern
+    return NPC(
+        name=intern(npc_data.get("name", "")),
+        dialogue=intern(npc_data.get("dialogue", "No dialogue available.")),
+        reward_points=npc_data.get("reward_points", 0),
+        location=npc_data.get("location"),
+        mission_items=strings.intern_all(npc_data.get("mission_items", [])),
+        mission_complete_description=intern(npc_data.get("mission_complete_description", "")),
+        # Ensure selling_items is always a dictionary
+        selling_items={intern(name): price for name, price in npc_data.get("selling_items", {}).items()}
+    )
+
+
+def build_exits(location: Location, locations: Mapping[int, Location], strings: StringPool) -> dict[str, int]:
+    """Return the given location's exits, keyed by case-folded command (interned through the given
+    pool), keeping only those that lead to a location in locations (digit-string targets are
+    converted to ints)."""
+    return {strings.intern(command): target
+            for command, target in _resolve_exits(location.available_commands, locations).items()}
+
+
+def _resolve_exits(available_commands: dict[str, Any], locations: Mapping[int, Any]) -> dict[str, int]:
+    """Return the exits among the given available commands, as build_exits does, but without
+    interning their commands."""
+    exits = {}
+    for command, target in available_commands.items():
+        if isinstance(target, str) and target.isdigit():
+            target = int(target)
+        if isinstance(target, int) and target in locations:
+            exits[command.casefold()] = target
+    return exits
+
+
+class LazyLocations(Mapping):
+    """A mapping from location id to Location that keeps each location as its raw game data
+    record until it is first looked up, and then builds and caches its Location.
+
+    Membership tests, len() and iter_exits() never build a Location; iterating over values() or
+    items() builds every location.
+
+    Instance Attributes:
+        - records: A mapping from location id to the raw record of each location not yet built.
+        - built: A mapping from location id to each Location built so far.
+        - strings: The pool that built locations' strings are interned through.
+
+    Representation Invariants:
+        - not any(loc_id in self.built for loc_id in self.records)
+    """
+    records: dict[int, dict[str, Any]]
+    built: dict[int, Location]
+    strings: StringPool
+
+    def __init__(self, records: dict[int, dict[str, Any]], strings: StringPool) -> None:
+        """Initialize a lazy mapping over the given raw location records."""
+        self.records = records
+        self.built = {}
+        self.strings = strings
+
+    def __getitem__(self, loc_id: int) -> Location:
+        """Return the Location with the given id, building it if this is its first lookup."""
+        location = self.built.get(loc_id)
+        if location is None:
+            record = self.records.pop(loc_id)
+            location = location_from_record(record, self.strings)
+            location.exits = build_exits(location, self, self.strings)
+            self.built[loc_id] = location
+        return location
+
+    def __contains__(self, loc_id: object) -> bool:
+        """Return whether there is a location with the given id."""
+        return loc_id in self.built or loc_id in self.records
+
+    def __iter__(self) -> Iterator[int]:
+        """Return an iterator over every location id."""
+        return itertools.chain(self.built, self.records)
+
+    def __len__(self) -> int:
+        """Return the number of locations."""
+        return len(self.built) + len(self.records)
+
+    def iter_exits(self) -> Iterator[tuple[int, str, int]]:
+        """Yield (location id, case-folded command, target id) for every exit of every location,
+        reading the exits of locations not yet built from their records."""
+        # A location may be built by another thread meanwhile; it is then found in records
+        records = list(self.records.items())
+        for loc_id, record in records:
+            for command, target in _resolve_exits(record.get('available_commands', {}), self).items():
+                yield loc_id, command, target
+        seen = {loc_id for loc_id, _ in records}
+        for loc_id, location in list(self.built.items()):
+            if loc_id not in seen:
+                for command, target in location.exits.items():
+                    yield loc_id, command, target
+
+
+class WorldBuilder:
+    """Builds a World from location, item and NPC records added one at a time.
+
+    Sections may be added in any order; locations' exits and the item placements are
+    computed by finish(), once every location is known. A lazy builder keeps location records
+    as they are and finish() wraps them in a LazyLocations; a compact builder appends them to an
+    ArrayLocations.
+
+    Instance Attributes:
+        - lazy: Whether locations are kept as raw records until they are first looked up.
+        - compact: Whether locations are stored in an ArrayLocations.
+        - locations: The locations built so far (or, if lazy, their raw records), keyed by id,
+          or the ArrayLocations they are stored in if compact.
+        - items: The items built so far.
+        - npcs: The NPCs built so far.
+        - strings: The pool every string of the world is interned through.
+        - timings: A mapping from each build phase to the number of seconds spent in it so far.
+        - puzzle_locations: The ids of the locations added so far that have a puzzle, in order.
+
+    Representation Invariants:
+        - not (self.lazy and self.compact)
+    """
+    lazy: bool
+    compact: bool
+    locations: dict[int, Location | dict[str, Any]] | ArrayLocations
+    items: ItemCatalog
+    npcs: NPCRegistry
+    strings: StringPool
+    timings: dict[str, float]
+    puzzle_locations: list[int]
+
+    def __init__(self, timings: Optional[dict[str, float]] = None, lazy: bool = False,
+                 compact: bool = False) -> None:
+        """Initialize a builder with no records, adding its phase timings to the given timings.
+
+        Preconditions:
+            - not (lazy and compact)
+        """
+        self.lazy = lazy
+        self.compact = compact
+        self.strings = StringPool()
+        self.locations = ArrayLocations(self.strings) if compact else {}
+        self.items = ItemCatalog()
+        self.npcs = NPCRegistry()
+        self.timings = timings if timings is not None else {}
+        self.puzzle_locations = []
+
+    def add_locations(self, records: Iterable[dict[str, Any]]) -> None:
+        """Build and add a location for each of the given location records."""
+        start = time.perf_counter()
+        if self.compact:
+            for loc in records:
+                self.locations.append(loc)
+                if loc.get('puzzle'):
+                    self.puzzle_locations.append(loc['id'])
+        elif self.lazy:
+            for loc in records:
+                self.locations[loc['id']] = loc
+                if loc.get('puzzle'):
+                    self.puzzle_locations.append(loc['id'])
+        else:
+            for loc in records:
+                location = location_from_record(loc, self.strings)
+                self.locations[location.id_num] = location
+                if location.puzzle:
+                    self.puzzle_locations.append(location.id_num)
+        self._add_time('locations', start)
+
+    def add_items(self, records: Iterable[dict[str, Any]]) -> None:
+        """Build and add an item for each of the given item records."""
+        start = time.perf_counter()
+        for item in records:
+            self.items.add(item_from_record(item, self.strings))
+        self._add_time('items', start)
+
+    def add_npcs(self, records: Iterable[dict[str, Any]]) -> None:
+        """Build and add an NPC for each of the given NPC records."""
+        start = time.perf_counter()
+        for npc_data in records:
+            self.npcs.add(npc_from_record(npc_data, self.strings))
+        self._add_time('npcs', start)
+
+    def finish(self) -> World:
+        """Link the records added so far together and return the resulting World."""
+        start = time.perf_counter()
+        placements = ItemPlacements()
+        for item in self.items:
+            if item.start_position in self.locations:
+                placements.place(item.name, item.start_position)
+        self._add_time('items', start)
+
+        if self.lazy:
+            locations = LazyLocations(self.locations, self.strings)
+            return World(locations, self.items, placements, self.npcs, self.strings, self.timings,
+                         puzzle_locations=self.puzzle_locations)
+
+        start = time.perf_counter()
+        if self.compact:
+            self.locations.link()
+            self._add_time('locations', start)
+            return World(self.locations, self.items, placements, self.npcs, self.strings, self.timings,
+                         puzzle_locations=self.puzzle_locations)
+
+        for location in self.locations.values():
+            location.exits = build_exits(location, self.locations, self.strings)
+        self._add_time('locations', start)
+
+        return World(self.locations, self.items, placements, self.npcs, self.strings, self.timings,
+                     puzzle_locations=self.puzzle_locations)
+
+    def _add_time(self, phase: str, start: float) -> None:
+        """Add the time elapsed since start to the given phase."""
+        self.timings[phase] = self.timings.get(phase, 0.0) + time.perf_counter() - start
+
+
+def load_world(filename: str, lazy: bool = False, compact: bool = False) -> World:
+    """Return the World described by the game data JSON file with the given name.
+    If lazy is True, each Location is only built the first time it is looked up; if compact is
+    True, locations are stored in an ArrayLocations.
+
+    Preconditions:
+        - filename is the name of a valid game data JSON file
+    """
+    timings = {}
+    start = time.perf_counter()
+    with open(filename, 'rb') as f:
+        contents = f.read()
+    data = json.loads(contents)
+    timings['parse'] = time.perf_counter() - start
+    # The file is hashed while it is in memory, so a saved session can name the game data it was played on
+    start = time.perf_counter()
+    source_hash = hashlib.sha256(contents).hexdigest()
+    timings['hash'] = time.perf_counter() - start
+
+    builder = WorldBuilder(timings, lazy, compact)
+    builder.add_locations(data['locations'])
+    builder.add_items(data['items'])
+    builder.add_npcs(data.get('npcs', []))
+    world = builder.finish()
+    world.source_hash = source_hash
+    return world
+
+
+if __name__ == "__main__":
+    pass
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
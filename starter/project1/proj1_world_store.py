@@ -0,0 +1,302 @@
+"""CSC111 Project 1: Text Adventure Game - Compact World Store
+
+Module Description
+==================
+
+This module contains ArrayLocations, a world backend for very large (e.g. procedurally
+generated) maps. Instead of one Location object per location, each per-location field is kept
+in a typed array indexed by a dense integer index, and exits are stored in compressed sparse
+row form: the exits of the location at index i are exit_commands/exit_targets[exit_offsets[i]:
+exit_offsets[i + 1]], sorted by command id.
+
+Looking a location up returns a LocationView, a small object that reads the arrays and has the
+same attributes as a Location, so AdventureGame works with either backend. The views of the
+most recently looked up locations are kept, and a view builds a dict of its exits the first
+time they are used, so the moves a game makes from its current location are dict lookups.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from array import array
+from collections.abc import Mapping
+from typing import Any, Iterator, Optional
+
+from game_entities import StringPool
+
+# The value stored in an integer array for a missing (None) value
+NONE = -1
+
+# The rarely-set location fields kept in ArrayLocations.extras
+_EXTRA_FIELDS = ('items', 'rooms_contained', 'condition_to_unlock', 'puzzle')
+
+# The most location views an ArrayLocations keeps between lookups
+VIEW_CACHE_SIZE = 4096
+
+
+class ArrayLocations(Mapping):
+    """A mapping from location id to LocationView, storing every location's data in typed arrays.
+
+    Locations are appended as raw game data records; link() must be called once every location
+    has been appended, before the store is used.
+
+    Instance Attributes:
+        - ids: The location id at each dense index.
+        - index_of: A mapping from location id to dense index, or None if every id equals its index.
+        - steps_allowed: The step limit at each dense index, or NONE.
+        - npcs: The string pool id of the name of the NPC at each dense index, or NONE.
+        - exit_offsets: The start of each dense index's exits in exit_commands and exit_targets,
+          followed by the total number of exits.
+        - exit_commands: The string pool id of each exit's case-folded command.
+        - exit_targets: The dense index of each exit's target location.
+        - strings: The pool that exit commands, NPC names and descriptions are interned through.
+        - brief_descriptions: The brief description at each dense index.
+        - long_descriptions: The long description at each dense index.
+        - extras: A mapping from dense index to the rarely-set fields of that location
+          (items, rooms_contained, condition_to_unlock, puzzle) that are not empty.
+
+    Representation Invariants:
+        - len(self.ids) == len(self.steps_allowed) == len(self.npcs)
+        - len(self.exit_offsets) == len(self.ids) + 1
+        - len(self.exit_commands) == len(self.exit_targets) == self.exit_offsets[-1]
+    """
+    ids: array
+    index_of: Optional[dict[int, int]]
+    steps_allowed: array
+    npcs: array
+    exit_offsets: array
+    exit_commands: array
+    exit_targets: array
+    strings: StringPool
+    brief_descriptions: list[str]
+    long_descriptions: list[str]
+    extras: dict[int, dict[str, Any]]
+    # Private Instance Attributes:
+    #   - _raw_exits: until link() is called, the (command, target) pairs of each location, unvalidated.
+    #   - _views: the views of recently looked up locations, keyed by location id; it is emptied
+    #     when it holds VIEW_CACHE_SIZE views.
+    _raw_exits: Optional[list[list[tuple[str, Any]]]]
+    _views: dict[int, LocationView]
+
+    def __init__(self, strings: Optional[StringPool] = None) -> None:
+        """Initialize an empty store whose strings are interned through the given pool."""
+        self.ids = array('q')
+        self.index_of = None
+        self.steps_allowed = array('q')
+        self.npcs = array('l')
+        self.exit_offsets = array('q', [0])
+        self.exit_commands = array('l')
+        self.exit_targets = array('q')
+        self.strings = strings if strings is not None else StringPool()
+        self.brief_descriptions = []
+        self.long_descriptions = []
+        self.extras = {}
+        self._raw_exits = []
+        self._views = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Return the state to pickle, without the cached views."""
+        state = self.__dict__.copy()
+        state['_views'] = {}
+        return state
+
+    def append(self, loc: dict[str, Any]) -> None:
+        """Add the location described by the given game data record."""
+        index = len(self.ids)
+        loc_id = loc['id']
+        if self.index_of is None and loc_id != index:
+            self.index_of = {earlier_id: i for i, earlier_id in enumerate(self.ids)}
+        if self.index_of is not None:
+            self.index_of[loc_id] = index
+
+        self.ids.append(loc_id)
+        steps = loc.get('steps_allowed', None)
+        self.steps_allowed.append(NONE if steps is None else steps)
+        npc = loc.get('npc', None)
+        self.npcs.append(NONE if npc is None else self.strings.id_of(npc))
+        intern = self.strings.intern
+        self.brief_descriptions.append(intern(loc.get('brief_description', "No brief description available.")))
+        self.long_descriptions.append(intern(loc.get('long_description', "No long description available.")))
+
+        extras = {key: loc[key] for key in _EXTRA_FIELDS if loc.get(key)}
+        if extras:
+            self.extras[index] = extras
+        self._raw_exits.append(list(loc.get('available_commands', {}).items()))
+
+    def link(self) -> None:
+        """Resolve every location's exits to dense indexes.
+
+        As with proj1_world_loader.build_exits, exit commands are case-folded, digit-string
+        targets are converted to ints and exits leading to unknown locations are dropped.
+        """
+        for raw_exits in self._raw_exits:
+            exits = {}
+            for command, target in raw_exits:
+                if isinstance(target, str) and target.isdigit():
+                    target = int(target)
+                if isinstance(target, int) and target in self:
+                    exits[self.strings.id_of(command.casefold())] = self._index(target)
+            for command_id in sorted(exits):
+                self.exit_commands.append(command_id)
+                self.exit_targets.append(exits[command_id])
+            self.exit_offsets.append(len(self.exit_commands))
+        self._raw_exits = None
+
+    def iter_exits(self) -> Iterator[tuple[int, str, int]]:
+        """Yield (location id, case-folded command, target id) for every exit of every location,
+        read from the arrays without making any LocationView."""
+        ids, strings, commands, targets = self.ids, self.strings, self.exit_commands, self.exit_targets
+        for index, loc_id in enumerate(ids):
+            for pos in range(self.exit_offsets[index], self.exit_offsets[index + 1]):
+                yield loc_id, strings[commands[pos]], ids[targets[pos]]
+
+    def __getitem__(self, loc_id: int) -> LocationView:
+        """Return a view of the location with the given id."""
+        view = self._views.get(loc_id)
+        if view is None:
+            if loc_id not in self:
+                raise KeyError(loc_id)
+            if len(self._views) >= VIEW_CACHE_SIZE:
+                self._views.clear()
+            view = self._views[loc_id] = LocationView(self, self._index(loc_id))
+        return view
+
+    def __contains__(self, loc_id: object) -> bool:
+        """Return whether there is a location with the given id."""
+        if self.index_of is not None:
+            return loc_id in self.index_of
+        return isinstance(loc_id, int) and 0 <= loc_id < len(self.ids)
+
+    def __iter__(self) -> Iterator[int]:
+        """Return an iterator over every location id."""
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        """Return the number of locations."""
+        return len(self.ids)
+
+    def _index(self, loc_id: int) -> int:
+        """Return the dense index of the location with the given id."""
+        return loc_id if self.index_of is None else self.index_of[loc_id]
+
+
+class LocationView:
+    """A Location stored in an ArrayLocations. It has the same attributes as a Location.
+
+    Only the exits are kept from a location's available commands, so available_commands holds
+    the case-folded commands that lead to an existing location.
+    """
+    __slots__ = ('_store', '_index', '_exits')
+    # Private Instance Attributes:
+    #   - _store: the store the location is kept in.
+    #   - _index: the dense index of the location in the store.
+    #   - _exits: a mapping from each case-folded exit command to its target location id, or None
+    #     until the exits are first used.
+    _store: ArrayLocations
+    _index: int
+    _exits: Optional[dict[str, int]]
+
+    def __init__(self, store: ArrayLocations, index: int) -> None:
+        self._store = store
+        self._index = index
+        self._exits = None
+
+    @property
+    def id_num(self) -> int:
+        """Return the id of this location."""
+        return self._store.ids[self._index]
+
+    @property
+    def brief_description(self) -> str:
+        """Return the brief description of this location."""
+        return self._store.brief_descriptions[self._index]
+
+    @property
+    def long_description(self) -> str:
+        """Return the long description of this location."""
+        return self._store.long_descriptions[self._index]
+
+    @property
+    def available_commands(self) -> dict[str, int]:
+        """Return a mapping from each of this location's exit commands to its target location id."""
+        return dict(self.exits.items())
+
+    @property
+    def exits(self) -> dict[str, int]:
+        """Return a mapping from each of this location's case-folded exit commands to its target
+        location id. The mapping is built the first time it is asked for; do not mutate it."""
+        if self._exits is None:
+            store = self._store
+            ids, strings, commands, targets = store.ids, store.strings, store.exit_commands, store.exit_targets
+            self._exits = {strings[commands[pos]]: ids[targets[pos]]
+                           for pos in range(store.exit_offsets[self._index], store.exit_offsets[self._index + 1])}
+        return self._exits
+
+    @property
+    def items(self) -> set[str]:
+        """Return the names of the items listed at this location in the game data."""
+        return set(self._extra('items', ()))
+
+    @property
+    def rooms_contained(self) -> list[str]:
+        """Return the rooms that belong to this location."""
+        return self._extra('rooms_contained', [])
+
+    @property
+    def condition_to_unlock(self) -> Optional[str]:
+        """Return the condition required to access this location, if any."""
+        return self._extra('condition_to_unlock', None)
+
+    @property
+    def steps_allowed(self) -> Optional[int]:
+        """Return the number of steps allowed in this location, if limited."""
+        steps = self._store.steps_allowed[self._index]
+        return None if steps == NONE else steps
+
+    @property
+    def npc(self) -> Optional[str]:
+        """Return the name of the NPC at this location, if any."""
+        name_id = self._store.npcs[self._index]
+        return None if name_id == NONE else self._store.strings[name_id]
+
+    @property
+    def puzzle(self) -> Optional[str]:
+        """Return the puzzle at this location, if any."""
+        return self._extra('puzzle', None)
+
+    def _extra(self, key: str, default: Any) -> Any:
+        """Return the given rarely-set field of this location, or default if it is not set."""
+        extras = self._store.extras.get(self._index)
+        return default if extras is None else extras.get(key, default)
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether other is a view of the same stored location."""
+        return isinstance(other, LocationView) and other._store is self._store and other._index == self._index
+
+    def __hash__(self) -> int:
+        """Return a hash consistent with __eq__."""
+        return hash((id(self._store), self._index))
+
+    def __repr__(self) -> str:
+        """Return a short representation of this view."""
+        return f"LocationView(id_num={self.id_num}, brief_description={self.brief_description!r})"
+
+
+if __name__ == "__main__":
+    pass
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
@@ -0,0 +1,329 @@
+"""CSC111 Project 1: Text Adventure Game - Streaming World Loader
+
+Module Description
+==================
+
+This module loads a game data file one record at a time. Instead of parsing the whole JSON
+document into memory and then building the world from it, it walks the top-level "locations",
+"items" and "npcs" arrays and hands each record to a WorldBuilder as soon as it is decoded,
+so peak memory is the size of the built world plus one read buffer. The file is hashed as it
+is read, so the world records the same source_hash without reading the file twice.
+
+load_world_streaming gives the same World as proj1_world_loader.load_world, and can be passed
+to AdventureGame as its world_loader.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import hashlib
+import io
+import itertools
+import json
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Iterator, Optional, TextIO
+
+from proj1_world_loader import World, WorldBuilder
+
+SECTIONS = ('locations', 'items', 'npcs')
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class _HashingReader(io.RawIOBase):
+    """A binary reader that adds every byte it reads from a file to a hash.
+
+    Instance Attributes:
+        - seconds: The time spent hashing so far.
+    """
+    seconds: float
+    # Private Instance Attributes:
+    #   - _raw: the binary file being read.
+    #   - _digest: the hash every byte read is added to, or None to read without hashing.
+    _raw: io.BufferedReader
+    _digest: Optional[Any]
+
+    def __init__(self, raw: io.BufferedReader, digest: Optional[Any]) -> None:
+        """Initialize a reader of the given binary file that adds what it reads to the given hash
+        (a hashlib hash object), if any."""
+        super().__init__()
+        self._raw = raw
+        self._digest = digest
+        self.seconds = 0.0
+
+    def readable(self) -> bool:
+        """Return True: this reader can be read from."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Read bytes from the file into the given buffer, hash them and return how many were read."""
+        size = self._raw.readinto(buffer)
+        if self._digest is not None:
+            start = time.perf_counter()
+            self._digest.update(memoryview(buffer)[:size])
+            self.seconds += time.perf_counter() - start
+        return size
+
+    def hash_rest(self) -> None:
+        """Read the rest of the file, only to hash it."""
+        buffer = bytearray(1 << 16)
+        while self.readinto(buffer):
+            pass
+
+
+class _JSONStream:
+    """A reader that decodes one JSON value at a time from a text file, buffering only as much
+    of the file as the value being decoded needs."""
+    # Private Instance Attributes:
+    #   - _file: the file being read.
+    #   - _chunk_size: the minimum number of characters read from the file at once.
+    #   - _buf: the part of the file read but not yet consumed starts at _buf[_pos].
+    #   - _pos: the index of the next unconsumed character in _buf.
+    #   - _eof: whether the whole file has been read into _buf.
+    _file: TextIO
+    _chunk_size: int
+    _buf: str
+    _pos: int
+    _eof: bool
+
+    def __init__(self, file: TextIO, chunk_size: int) -> None:
+        """Initialize a stream over the given text file, reading at least chunk_size characters at a time."""
+        self._file = file
+        self._chunk_size = chunk_size
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read more of the file into the buffer, dropping the consumed part.
+        Return False if the file has no more data.
+
+        The amount read doubles with the unconsumed buffer size, so decoding one very large
+        value stays linear in its size.
+        """
+        chunk = self._file.read(max(self._chunk_size, len(self._buf) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or '' at the end of the file."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars: str) -> str:
+        """Consume and return the next non-whitespace character, which must be one of chars."""
+        char = self.peek()
+        if char == '' or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in game data, found {char or 'end of file'!r}")
+        self._pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode and return the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self._buf, self._pos)
+                # A number that ends exactly at the end of the buffer may continue in the file
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+
+def iter_records(filename: str, chunk_size: int = 1 << 16, digest: Optional[Any] = None,
+                 timings: Optional[dict[str, float]] = None) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yield (section, record) for every record of the "locations", "items" and "npcs" arrays
+    of the given game data file (UTF-8), in file order. Other top-level keys are skipped.
+
+    If digest (a hashlib hash object) is given, every byte of the file has been added to it once
+    the iterator is exhausted, and the seconds spent hashing are added to timings["hash"] (if
+    timings is given).
+    """
+    with open(filename, 'rb') as raw:
+        reader = _HashingReader(raw, digest)
+        stream = _JSONStream(io.TextIOWrapper(io.BufferedReader(reader), encoding='utf-8'), chunk_size)
+        yield from _iter_sections(stream)
+        if digest is not None:
+            reader.hash_rest()
+        if timings is not None:
+            timings['hash'] = timings.get('hash', 0.0) + reader.seconds
+
+
+def _iter_sections(stream: _JSONStream) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yield (section, record) for every record of the sections of the game data in the given stream."""
+    stream.expect('{')
+    if stream.peek() == '}':
+        return
+    while True:
+        key = stream.value()
+        stream.expect(':')
+        if key in SECTIONS and stream.peek() == '[':
+            stream.expect('[')
+            if stream.peek() == ']':
+                stream.expect(']')
+            else:
+                while True:
+                    yield key, stream.value()
+                    if stream.expect(',]') == ']':
+                        break
+        else:
+            stream.value()
+        if stream.expect(',}') == '}':
+            return
+
+
+def _timed(pairs: Iterator[tuple[str, Any]], decode_times: dict[Optional[str], float]) -> Iterator[tuple[str, Any]]:
+    """Yield the given (section, record) pairs, adding the time taken to produce each one to
+    decode_times[section], and the time taken to find there are no more to decode_times[None]."""
+    while True:
+        start = time.perf_counter()
+        pair = next(pairs, None)
+        section = None if pair is None else pair[0]
+        decode_times[section] = decode_times.get(section, 0.0) + time.perf_counter() - start
+        if pair is None:
+            return
+        yield pair
+
+
+def load_world_streaming(filename: str, lazy: bool = False, compact: bool = False) -> World:
+    """Return the World described by the game data JSON file with the given name, decoding one
+    record at a time and hashing the file as it is read. As with load_world, the world's timings
+    have separate "parse" (decoding records) and "hash" phases, which the build phases do not
+    include. If lazy is True, each Location is only built the first time it is looked up; if
+    compact is True, locations are stored in an ArrayLocations.
+
+    Preconditions:
+        - filename is the name of a valid game data JSON file
+    """
+    digest = hashlib.sha256()
+    timings = {}
+    # The time spent producing each section's records, which the builder counts in that section's phase
+    decode_times = {}
+    builder = WorldBuilder(timings, lazy, compact)
+    adders = {'locations': builder.add_locations, 'items': builder.add_items, 'npcs': builder.add_npcs}
+    records = _timed(iter_records(filename, digest=digest, timings=timings), decode_times)
+    for section, group in itertools.groupby(records, key=lambda pair: pair[0]):
+        adders[section](record for _, record in group)
+    world = builder.finish()
+    world.source_hash = digest.hexdigest()
+
+    for section, seconds in decode_times.items():
+        if section is not None:
+            timings[section] -= seconds
+    timings['parse'] = max(0.0, sum(decode_times.values()) - timings['hash'])
+    return world
+
+
+def write_synthetic_game_data(filename: str, num_locations: int) -> None:
+    """Write a game data file with num_locations locations arranged in a ring, one item per
+    hundred locations and no NPCs. The file is written one record at a time."""
+    with open(filename, 'w') as f:
+        f.write('{"locations": [\n')
+        for i in range(num_locations):
+            record = {
+                'id': i,
+                'brief_description': f"Room {i}",
+                'long_description': f"You are in room {i} of a very long corridor.",
+                'available_commands': {'go north': (i + 1) % num_locations, 'go south': (i - 1) % num_locations}
+            }
+            f.write(('' if i == 0 else ',\n') + json.dumps(record))
+        f.write('\n], "items": [\n')
+        f.write(',\n'.join(json.dumps({'name': f"item {i}", 'start_position': i, 'target_points': 0})
+                           for i in range(0, num_locations, 100)))
+        f.write('\n], "npcs": []}\n')
+
+
+def measure_streaming_peak(num_locations: int) -> tuple[int, int, int]:
+    """Write a synthetic game data file with num_locations locations, decode all of its records with
+    iter_records, and return (number of records, file size in bytes, peak traced memory in bytes)."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, 'synthetic_game_data.json')
+        write_synthetic_game_data(filename, num_locations)
+        file_size = os.path.getsize(filename)
+
+        tracemalloc.start()
+        try:
+            num_records = sum(1 for _ in iter_records(filename))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return num_records, file_size, peak
+
+
+def measure_loading_peak(loader: Callable[[str], World], num_locations: int) -> tuple[int, int, int]:
+    """Write a synthetic game data file with num_locations locations, load a world from it with the
+    given loader, and return (file size in bytes, traced memory the world holds in bytes, peak traced
+    memory while loading in bytes)."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, 'synthetic_game_data.json')
+        write_synthetic_game_data(filename, num_locations)
+        file_size = os.path.getsize(filename)
+
+        tracemalloc.start()
+        try:
+            world = loader(filename)
+            retained, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    del world
+    return file_size, retained, peak
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+
+    # The streaming loader must build exactly the same world as the regular loader
+    from proj1_world_loader import load_world
+    regular, streamed = load_world('game_data.json'), load_world_streaming('game_data.json')
+    assert regular.locations == streamed.locations
+    assert regular.items.items == streamed.items.items
+    assert regular.placements.by_item == streamed.placements.by_item
+    assert list(regular.npcs) == list(streamed.npcs)
+    assert regular.source_hash == streamed.source_hash
+    assert {'parse', 'hash', 'locations', 'items'} <= streamed.timings.keys()
+
+    # Decoding a 1M-location file must only ever hold about one read buffer of it in memory
+    records, size, peak_bytes = measure_streaming_peak(1_000_000)
+    print(f"Decoded {records} records from a {size / 2 ** 20:.1f} MiB file; peak memory {peak_bytes / 2 ** 20:.2f} MiB")
+    assert peak_bytes < 4 * 2 ** 20
+
+    # Loading a world with it must only ever hold the world plus about one read buffer, whereas
+    # load_world also holds the parsed document
+    for world_loader in (load_world_streaming, load_world):
+        size, world_bytes, peak_bytes = measure_loading_peak(world_loader, 100_000)
+        print(f"{world_loader.__name__}: {size / 2 ** 20:.1f} MiB file; world {world_bytes / 2 ** 20:.1f} MiB, "
+              f"peak {peak_bytes / 2 ** 20:.1f} MiB")
+        if world_loader is load_world_streaming:
+            assert peak_bytes - world_bytes < 4 * 2 ** 20